@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt6.QtCore import QTimer
 
 from src.canvas_manager import CanvasManager
 from src.default_constants import DEFAULT_XMIN, DEFAULT_XMAX, DEFAULT_YMIN, DEFAULT_YMAX
@@ -12,6 +13,7 @@ class Canvas(FigureCanvas):
         self.fig, self.ax = plt.subplots()
         super().__init__(self.fig)
         self.app = app
+        self.redraw_scheduled = False  # True if a redraw is waiting in the event queue
         self.pyplot_code()
 
     def pyplot_code(self):
@@ -39,6 +41,20 @@ class Canvas(FigureCanvas):
     def set_ylim(self, ylim):
         self.ax.set_ylim(ylim)
 
+    def set_view_only(self, xlim, ylim):
+        """Changes the displayed lims and repaints the canvas without recalculating the arrows."""
+        self.set_xlim(xlim)
+        self.set_ylim(ylim)
+        self.manager.request_redraw()
+
+    def set_limits(self, xlim, ylim):
+        """Sets both lims and redraws the field once. A lim with min >= max is ignored."""
+        if xlim[0] < xlim[1]:
+            self.set_xlim(xlim)
+        if ylim[0] < ylim[1]:
+            self.set_ylim(ylim)
+        self.redraw()
+
     def zoom(self, zoom_in: bool):
         self.manager.zoom(zoom_in)
 
@@ -61,61 +77,75 @@ class Canvas(FigureCanvas):
         self.redraw()
 
     def set_num_arrows(self, num_arrows):
+        if self.manager.field_settings.num_arrows == num_arrows:
+            return
         self.manager.field_settings.num_arrows = num_arrows
         self.redraw()
 
-    def set_arrow_length(self, arrow_length):
-        self.manager.field_settings.arrow_length = arrow_length
-        self.redraw()
-
-    def set_arrow_width(self, arrow_width):
-        self.manager.field_settings.arrow_width = arrow_width
-        self.redraw()
-
-    def set_color_contrast(self, color_contrast):
-        self.manager.field_settings.color_contrast = color_contrast
-        self.redraw()
-
-    def set_color_precision(self, color_precision):
-        self.manager.field_settings.color_precision = color_precision
-        self.redraw()
+    def update_field_settings(self, **settings):
+        """Changes several field settings at once, the field is redrawn only once and only if something changed."""
+        changed = set()
+        for name, value in settings.items():
+            if getattr(self.manager.field_settings, name) != value:
+                setattr(self.manager.field_settings, name, value)
+                changed.add(name)
+        # only the curvatures change, they are recalculated without blocking the GUI
+        if changed == {"color_precision"}:
+            self.manager.compute_field_in_background()
+        elif changed:
+            self.redraw()
 
     def set_show_field_colors(self, show_colors):
+        show_colors = bool(show_colors)  # checkboxes emit Qt.CheckState values
+        if self.manager.field_settings.show_colors == show_colors:
+            return
         self.manager.field_settings.show_colors = show_colors
         self.redraw()
 
     def set_color_map(self, color_map):
+        if self.manager.field_settings.color_map == color_map:
+            return
         self.manager.field_settings.color_map = color_map
         self.redraw()
 
     def set_grid_enabled(self, enabled):
+        enabled = bool(enabled)
+        if self.manager.field_settings.show_grid == enabled:
+            return
         self.manager.field_settings.show_grid = enabled
         self.redraw()
 
     def set_axes_enabled(self, enabled):
+        enabled = bool(enabled)
+        if self.manager.field_settings.show_axes == enabled:
+            return
         self.manager.field_settings.show_axes = enabled
         self.redraw()
 
     def set_mouse_line_width(self, mouse_line_width):
+        if self.manager.mouse_line_width == mouse_line_width:
+            return
         self.manager.mouse_line_width = mouse_line_width
         self.manager.draw_mouse_line()
 
     def set_mouse_line_length(self, mouse_line_length):
+        if self.manager.mouse_line_length == mouse_line_length:
+            return
         self.manager.mouse_line_length = mouse_line_length
         self.manager.draw_mouse_line()
 
     def set_drawing_mouse_line(self, drawing_mouse_line):
+        drawing_mouse_line = bool(drawing_mouse_line)
+        if self.manager.drawing_mouse_line == drawing_mouse_line:
+            return
         self.manager.drawing_mouse_line = drawing_mouse_line
         if drawing_mouse_line:
             self.manager.draw_mouse_line()
         else:
             self.manager.remove_mouse_line_from_plot()
 
-    def set_new_function(self, new_function: str) -> bool:
-        if self.manager.set_new_function(new_function):
-            self.redraw()
-            return True
-        return False
+    def set_new_function(self, new_function: str):
+        self.manager.set_new_function(new_function)
 
     def set_equal_axes(self):
         self.redraw()
@@ -129,4 +159,16 @@ class Canvas(FigureCanvas):
         self.app.update_displayed_lims()
 
     def redraw(self):
+        """Recalculates the field, the canvas itself is repainted with draw_idle --> repeated redraws are merged."""
         self.manager.draw_field()
+
+    def schedule_redraw(self):
+        """Redraws the field once control returns to the event loop. Repeated calls before that are merged."""
+        if self.redraw_scheduled:
+            return
+        self.redraw_scheduled = True
+        QTimer.singleShot(0, self.run_scheduled_redraw)
+
+    def run_scheduled_redraw(self):
+        self.redraw_scheduled = False
+        self.redraw()
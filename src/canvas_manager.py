@@ -1,11 +1,12 @@
+from PyQt6.QtCore import QThread
 from PyQt6.QtWidgets import QMessageBox
 import numpy as np
+from math import hypot
 
 np.seterr(divide="raise", invalid="ignore")
 
 
-from src.math_functions import *
-from src.default_constants import *
+from src.default_constants import DEFAULT_MOUSE_LINE_WIDTH, DEFAULT_MOUSE_LINE_LENGTH, ZOOM, MAX_ZOOM
 
 from src.tracing.trace_settings import TraceSettings
 from src.tracing.solution_tracer import SolutionTracer
@@ -18,6 +19,7 @@ from src.direction_field.direction_field_builder import (
 
 from src.threading.parallel_tracer import ParallelTracer
 from src.threading.trace_manager import TraceManager
+from src.threading.field_compute_worker import FieldComputeWorker
 
 
 class CanvasManager:
@@ -36,12 +38,14 @@ class CanvasManager:
         self.field_settings = DirectionFieldSettings()
         self.field_builder = DirectionFieldBuilder(self.plot, self.field_settings)
         self.field_plotter = DirectionFieldPlotter(self.plot, self.field_settings)
+        self.create_field_compute_worker()
 
         self.canvas_locked = False  # True if the canvas can be moved
         self.press = None  # holds x, y of pressed point while moving, else None
         self.moving_canvas = False  # True if the canvas is being moved
         self.drawing_mouse_line = False
         self.last_mouse_line = None
+        self.mouse_line_background = None  # saved canvas for blitting the mouse line
         self.mouse_pos = None
 
         self.mouse_line_width = DEFAULT_MOUSE_LINE_WIDTH
@@ -52,6 +56,19 @@ class CanvasManager:
     def stop_all_threads(self):
         """Stops all the threads."""
         self.trace_manager.stop_all_threads()
+        self.field_compute_thread.quit()
+        self.field_compute_thread.wait()
+
+    def create_field_compute_worker(self):
+        """Creates and starts a worker calculating direction fields of new slope functions"""
+        self.field_compute_thread = QThread()
+        self.field_compute_worker = FieldComputeWorker(self.plot, self.field_settings)
+        self.field_compute_worker.moveToThread(self.field_compute_thread)
+        # emitted from the GUI thread --> queued to the worker thread
+        self.field_compute_worker.compute_requested.connect(self.field_compute_worker.compute)
+        self.field_compute_worker.finished.connect(self.on_field_computed)
+        self.field_compute_thread.finished.connect(self.field_compute_worker.deleteLater)
+        self.field_compute_thread.start()
 
     def lock_canvas(self, lock: bool):
         """Locks or unlocks the canvas."""
@@ -69,6 +86,26 @@ class CanvasManager:
             "motion_notify_event", self.on_motion
         )
         self.cidzoom = self.plot.figure.canvas.mpl_connect("scroll_event", self.on_scroll)
+        self.ciddraw = self.plot.figure.canvas.mpl_connect("draw_event", self.on_draw)
+        self.cidresize = self.plot.figure.canvas.mpl_connect("resize_event", self.on_resize)
+
+    def on_draw(self, event):
+        """Saves the background for blitting the mouse line and draws the line on top of it."""
+        # savefig draws with the vector backends (svg, pdf) as well, those can't blit
+        if not hasattr(event.canvas, "copy_from_bbox"):
+            return
+        self.mouse_line_background = event.canvas.copy_from_bbox(self.plot.axes.bbox)
+        if self.last_mouse_line is not None and self.last_mouse_line.get_visible():
+            self.plot.axes.draw_artist(self.last_mouse_line)
+
+    def on_resize(self, event):
+        """The saved background doesn't match the new canvas size."""
+        self.mouse_line_background = None
+
+    def request_redraw(self):
+        """Schedules a full redraw of the canvas, the mouse line background is saved again after it."""
+        self.mouse_line_background = None
+        self.plot.figure.canvas.draw_idle()
 
     def on_press(self, event):
         """
@@ -95,8 +132,6 @@ class CanvasManager:
             if self.last_mouse_line is not None:
                 # remove line - mouse is out of bounds
                 self.remove_mouse_line_from_plot()
-                self.plot.figure.canvas.draw()
-                self.last_mouse_line = None
             return
 
         if self.canvas_locked:
@@ -104,10 +139,10 @@ class CanvasManager:
 
         self.mouse_pos = (event.xdata, event.ydata)
 
-        # if a direction line is being drawn at the mouse location --> redraw after movement
-        if self.drawing_mouse_line:
-            self.draw_mouse_line()
         if self.press is None or not self.moving_canvas:
+            # if a direction line is being drawn at the mouse location --> redraw after movement
+            if self.drawing_mouse_line:
+                self.draw_mouse_line()
             return
 
         xlast, ylast = self.press
@@ -121,9 +156,12 @@ class CanvasManager:
         self.motion_counter += 1
         if self.motion_counter % 3 == 0:
             self.motion_counter = 0
-            self.draw_field(keep_cache=True)
+            self.draw_field(keep_cache=True)  # redraws the mouse line as well
         else:
-            self.plot.figure.canvas.draw()
+            self.request_redraw()
+            # the background is outdated while moving --> the line is drawn with the next full redraw
+            if self.drawing_mouse_line:
+                self.draw_mouse_line()
 
     def on_release(self, event):
         """Stops canvas movement or point movement."""
@@ -181,45 +219,67 @@ class CanvasManager:
         self.app.update_displayed_lims()
         self.draw_field()
 
-    def set_new_function(self, new_function_str: str) -> bool:
+    def set_new_function(self, new_function_str: str):
         """
-        Checks if the new slope-function is valid and sets it if it is.
-        Returns True if the function is valid, False otherwise.
+        Starts validating the new slope-function and calculating its direction field in the background.
+        The function is set and drawn by on_field_computed once the calculation is finished.
         """
 
         if new_function_str == self.field_settings.function_string:
-            return True
+            return
 
-        # check if the new function is syntactically correct
-        try:
-            new_function = create_function_from_string(new_function_str)
-        except SyntaxError:
-            return False
+        self.field_compute_worker.compute_requested.emit(new_function_str)
 
-        # save the previous function in case the new one is invalid
-        previous_function = self.field_settings.function
+    def compute_field_in_background(self):
+        """Recalculates the direction field of the current function in the worker thread."""
+        self.field_compute_worker.compute_requested.emit(self.field_settings.function_string)
 
-        # set new function and redraw the plot
-        self.field_settings.function = new_function
-        builder = DirectionFieldBuilder(self.plot, self.field_settings)
-        arrows = builder.get_arrows()
+    def on_field_computed(self, new_function_str: str, result):
+        """Sets the new slope-function and draws the direction field calculated by the worker."""
 
-        # if the function is invalid, revert and redraw the plot
-        if arrows is None:
-            self.field_settings.function = previous_function
-            return False
+        # if the function is invalid, keep the previous one
+        if result is None:
+            QMessageBox.critical(self.app, "Error", f"Invalid function.")
+            return
 
-        # if the function is valid, update the function string
+        # if the function is valid, set it
+        self.field_settings.function = result.settings.function
         self.field_settings.function_string = new_function_str
-        return True
+
+        # the view or the field settings might have changed in the meantime --> recalculate
+        if (
+            result.xlim != self.plot.axes.get_xlim()
+            or result.ylim != self.plot.axes.get_ylim()
+            or vars(result.settings) != vars(self.field_settings)
+        ):
+            self.draw_field()
+            return
+
+        self.trace_manager.stop_tracing()
+        self.field_builder.directions_cache = result.directions_cache
+        # the drawn arrows weren't calculated by field_builder
+        self.field_builder.grid_area = None
+        if result.arrows.size == 0:
+            return
+
+        # traced curves will be removed
+        self.has_trace_curves_on_plot = False
+
+        self.field_plotter.draw_field(result.arrows, result.colors)
+        # the mouse line was cleared together with the old field
+        self.last_mouse_line = None
+
+        self.request_redraw()
+        if self.drawing_mouse_line:
+            self.draw_mouse_line()
 
     def draw_field(self, keep_cache=False):
-        """Draws the direction field. If keep_cache is False, the arrow-cache is cleared."""
+        """Draws the direction field. If keep_cache is False, the directions-cache is cleared."""
 
         self.trace_manager.stop_tracing()
 
         if not keep_cache:
-            self.field_builder.arrows_cache = {}
+            self.field_builder.reset_directions_cache()
 
         result = self.field_builder.get_arrows()
         if result == None:
@@ -227,7 +287,7 @@ class CanvasManager:
             return
 
         arrows, arrow_centers = result
-        if len(arrows) == 0:
+        if arrows.size == 0:
             return
 
         # traced curves will be removed
@@ -235,10 +295,12 @@ class CanvasManager:
 
         colors = self.field_builder.get_colors(arrow_centers)
         self.field_plotter.draw_field(arrows, colors)
+        # the mouse line was cleared together with the old field
+        self.last_mouse_line = None
 
+        self.request_redraw()
         if self.drawing_mouse_line:
             self.draw_mouse_line()
-        self.plot.figure.canvas.draw()
 
     def trace_from_point(self, x, y):
         """Traces the curve from the point (x, y)"""
@@ -279,12 +341,24 @@ class CanvasManager:
 
     def remove_mouse_line_from_plot(self):
         """Remove the direction line drawn at the mouse cursor location"""
-        if self.last_mouse_line is not None:
-            try:
-                self.plot.axes.lines.remove(self.last_mouse_line[0])
-            except:
-                return
-            self.plot.figure.canvas.draw()
+        if self.last_mouse_line is not None and self.last_mouse_line.get_visible():
+            self.last_mouse_line.set_visible(False)
+            self.blit_mouse_line()
+
+    def blit_mouse_line(self):
+        """Repaints only the mouse line on top of the saved background instead of redrawing the whole canvas."""
+        canvas = self.plot.figure.canvas
+        # the figure is being saved with a vector backend --> nothing to blit on
+        if not hasattr(canvas, "restore_region"):
+            return
+        if self.mouse_line_background is None:
+            # the line is drawn on top of the new background in on_draw
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self.mouse_line_background)
+        if self.last_mouse_line is not None and self.last_mouse_line.get_visible():
+            self.plot.axes.draw_artist(self.last_mouse_line)
+        canvas.blit(self.plot.axes.bbox)
 
     def draw_mouse_line(self):
         """Draws a direction line at the mouse cursor location"""
@@ -293,7 +367,7 @@ class CanvasManager:
 
         xlim = self.plot.axes.get_xlim()
         ylim = self.plot.axes.get_ylim()
-        diagonal = np.sqrt((xlim[1] - xlim[0]) ** 2 + (ylim[1] - ylim[0]) ** 2)
+        diagonal = hypot(xlim[1] - xlim[0], ylim[1] - ylim[0])
         vector_len = diagonal / 40 * self.mouse_line_length
 
         # calculate coordinates of the new arrow
@@ -301,23 +375,27 @@ class CanvasManager:
             self.mouse_pos[0], self.mouse_pos[1], vector_len, use_cache=False
         )
 
-        # remove the old arrow
-        self.remove_mouse_line_from_plot()
-
-        # if the mouse cursor is in an area where the function is not defined --> return
+        # if the mouse cursor is in an area where the function is not defined --> hide the line
         if line_info is None:
+            self.remove_mouse_line_from_plot()
             return
 
-        # create the new arrow
+        # move the arrow to the new coordinates
         x1 = line_info[0]
         y1 = line_info[1]
         x2 = x1 + line_info[2]
         y2 = y1 + line_info[3]
-        self.last_mouse_line = self.plot.axes.plot(
-            [x1, x2],
-            [y1, y2],
-            color="r",
-            linewidth=self.mouse_line_width,
-            solid_capstyle="round",
-        )
-        self.plot.figure.canvas.draw()
+        if self.last_mouse_line is None:
+            # animated --> the line is excluded from full redraws and only blitted
+            (self.last_mouse_line,) = self.plot.axes.plot(
+                [x1, x2],
+                [y1, y2],
+                color="r",
+                solid_capstyle="round",
+                animated=True,
+            )
+        else:
+            self.last_mouse_line.set_data([x1, x2], [y1, y2])
+        self.last_mouse_line.set_linewidth(self.mouse_line_width)
+        self.last_mouse_line.set_visible(True)
+        self.blit_mouse_line()
@@ -1,8 +1,8 @@
 import numpy as np
 from matplotlib.colors import Normalize
-from matplotlib import cm
 
-from math import fabs
+from math import fabs, hypot
+from src.math_functions import create_vectorized_function_from_string
 from src.direction_field.direction_field_settings import DirectionFieldSettings
 
 
@@ -11,46 +11,66 @@ class DirectionFieldBuilder:
 
     def __init__(self, plot, settings: DirectionFieldSettings):
         self.settings = settings
-        self.arrows_cache = {}
+        self.directions_cache = {}
+        # (key, centers, directions) of the last arrow grid and (key, curvatures) of its colors
+        # --> changing only the arrow length, width or colors doesn't evaluate the function again
+        self.grid_cache = None
+        self.curvatures_cache = None
+        # (x_first, x_last, y_first, y_last, x_step, y_step) of the last calculated arrow grid
+        self.grid_area = None
         self.plot = plot
 
-    def reset_arrow_cache(self):
-        """Resets the arrow cache."""
-        self.arrows_cache = {}
+    def reset_directions_cache(self):
+        """
+        Resets the directions cache.
+        The cached arrow grid and curvatures are kept, their keys include the function and the grid.
+        """
+        self.directions_cache = {}
 
-    def get_arrow(self, x, y, arrow_len, use_cache=True):
+    def get_direction(self, x, y, use_cache=True):
         """
         x, y: center of the arrow
-        returns: [s1, s2, v1, v2] where (s1, s2) is the start of the arrow and (v1, v2) is the vector of the arrow
+        returns: (v1, v2) the direction of the slope at (x, y), or None if the function is not defined there
         """
 
         # check cache
-        if use_cache and (x, y) in self.arrows_cache:
-            return self.arrows_cache[(x, y)]
+        if use_cache and (x, y) in self.directions_cache:
+            return self.directions_cache[(x, y)]
 
         try:
-            der = self.settings.function(x, y)
-            vector = np.array([1, der])
+            direction = (1, self.settings.function(x, y))
         # this is raised in the case of nonzero/0 --> draw a vertical line
         except FloatingPointError:
-            vector = np.array([0, 1])
+            direction = (0, 1)
+        # e.g. exp(x*y), the slope is too steep to tell from a vertical line
+        except OverflowError:
+            direction = (0, 1)
         # this is raised in the case of 0/0  --> dont draw anything
         except ZeroDivisionError:
-            return None
+            direction = None
         # this is raised if the function is not defined at the point e.i. sqrt(-1)
         except ValueError:
-            return None
+            direction = None
         # e.i sinsin(x) --> this is taken care of later
         except NameError as e:
             raise e
 
-        center = np.array([x, y])
-        vector = vector / np.linalg.norm(vector) * arrow_len
-
-        res = np.append(center - vector / 2, vector)
         if use_cache:
-            self.arrows_cache[(x, y)] = res
-        return res
+            self.directions_cache[(x, y)] = direction
+        return direction
+
+    def get_arrow(self, x, y, arrow_len, use_cache=True):
+        """
+        x, y: center of the arrow
+        returns: [s1, s2, v1, v2] where (s1, s2) is the start of the arrow and (v1, v2) is the vector of the arrow
+        """
+
+        if (direction := self.get_direction(x, y, use_cache)) is None:
+            return None
+
+        center = np.array([x, y])
+        vector = np.array(direction) / hypot(*direction) * arrow_len
+        return np.append(center - vector / 2, vector)
 
     def get_curvature_at(self, x, y, dx):
         """
@@ -85,6 +105,44 @@ class DirectionFieldBuilder:
                 except:
                     return 0
 
+    def get_curvatures(self, xs, ys, dx):
+        """
+        Returns the curvatures of the function at all points (xs[i], ys[i]) at once.
+        Uses the same fallbacks as get_curvature_at, points where the curvature can't be calculated get 0.
+        """
+
+        function = create_vectorized_function_from_string(self.settings.function_string)
+
+        # same as the int(x) snapping in get_curvature_at
+        xs = np.where(np.fabs(xs - np.trunc(xs)) < dx, np.trunc(xs), xs)
+        ys = np.where(np.fabs(ys - np.trunc(ys)) < dx, np.trunc(ys), ys)
+
+        def get_curvature(x, y):
+            dy = np.broadcast_to(function(x, y), x.shape)
+            d2y = (function(x + dx, y + dx * dy) - function(x - dx, y - dx * dy)) / (2 * dx)
+            return np.broadcast_to(d2y / (1 + dy**2) ** 1.5, x.shape)
+
+        xlim = self.plot.axes.get_xlim()
+        ylim = self.plot.axes.get_ylim()
+        fix_dx = max(0.002, (xlim[1] - xlim[0]) / 1000)
+        fix_dy = max(0.002, (ylim[1] - ylim[0]) / 1000)
+
+        with np.errstate(all="ignore"):
+            curvatures = get_curvature(xs, ys)
+            if not np.isrealobj(curvatures):
+                raise TypeError("complex curvature")
+            curvatures = curvatures.astype(float)
+            # nan or inf --> the function isn't defined at the point, try moving it a bit
+            for shift_x, shift_y in ((0, fix_dy), (fix_dx, 0)):
+                undefined = ~np.isfinite(curvatures)
+                if not undefined.any():
+                    break
+                curvatures[undefined] = get_curvature(
+                    xs[undefined] + shift_x, ys[undefined] + shift_y
+                ).real
+        curvatures[~np.isfinite(curvatures)] = 0
+        return curvatures
+
     def normalize_curvatures(self, curvatures, ignore):
         """Normalizes curvatures to values between 0 and 1 while ignoring values off screen and the most extreme value"""
 
@@ -111,30 +169,80 @@ class DirectionFieldBuilder:
 
         return Normalize(clip=True, vmin=0, vmax=max_val)(curvatures)
 
-    def get_colors(self, points):
-        """Returns colors for the arrows based on the curvature of the function at the arrow's center."""
-
-        if not self.settings.show_colors:
-            return "black"
+    def get_normalized_curvatures(self, points):
+        """Returns the normalized curvatures at the Nx2 points, reusing the last result if nothing changed."""
 
-        xlim = self.plot.axes.get_xlim()  # save old lims
+        xlim = self.plot.axes.get_xlim()
         ylim = self.plot.axes.get_ylim()
         curvature_dx = self.settings.get_curvature_dx()
 
-        curvatures = []
-        ignore = []
-        for x, y in points:
-            curvatures.append(self.get_curvature_at(x, y, curvature_dx))
-            if xlim[0] <= x <= xlim[1] and ylim[0] <= y <= ylim[1]:
-                ignore.append(False)
-            else:
-                ignore.append(True)
+        key = (
+            self.settings.function_string,
+            self.settings.num_arrows,
+            curvature_dx,
+            xlim,
+            ylim,
+            points.tobytes(),
+        )
+        if self.curvatures_cache is not None and self.curvatures_cache[0] == key:
+            return self.curvatures_cache[1]
+
+        xs, ys = points.T
+
+        try:
+            curvatures = self.get_curvatures(xs, ys, curvature_dx)
+        # the function can't be evaluated on arrays --> point by point
+        except Exception:
+            curvatures = [self.get_curvature_at(x, y, curvature_dx) for x, y in zip(xs, ys)]
+
+        # ignore arrows off screen
+        ignore = (xs < xlim[0]) | (xs > xlim[1]) | (ys < ylim[0]) | (ys > ylim[1])
 
         curvatures = self.normalize_curvatures(np.abs(curvatures), ignore)
+        self.curvatures_cache = (key, curvatures)
+        return curvatures
 
+    def get_colors(self, points):
+        """
+        Returns colors for the arrows based on the curvature of the function at the arrow's center.
+        The colors are values between 0 and 1 which are mapped to RGBA by the color map when drawing.
+        """
+
+        if not self.settings.show_colors:
+            return "black"
+
+        curvatures = self.get_normalized_curvatures(np.array(points, dtype=float).reshape(-1, 2))
         exponent = self.settings.get_color_exp()
-        color_map = self.settings.color_map
-        return cm.get_cmap(color_map)(curvatures**exponent)
+        return np.nan_to_num(np.ma.filled(curvatures, 0) ** exponent)
+
+    def get_arrow_spacing(self, xlim, ylim):
+        """Returns (x_step, y_step), the space between arrows for the given lims."""
+        x_step = (xlim[1] - xlim[0]) / self.settings.num_arrows
+        y_step = (
+            (ylim[1] - ylim[0]) / self.settings.num_arrows
+            if self.plot.axes.get_aspect() != 1  # if auto axes
+            else x_step  # if equal_axes
+        )
+        return x_step, y_step
+
+    def covers_view(self, xlim, ylim) -> bool:
+        """
+        Checks if the last calculated arrows can be shown for the given lims without recalculating them.
+        The lims have to be inside the calculated area and the space between arrows has to stay about the same.
+        """
+        if self.grid_area is None:
+            return False
+        x_first, x_last, y_first, y_last, x_step, y_step = self.grid_area
+        new_x_step, new_y_step = self.get_arrow_spacing(xlim, ylim)
+        return (
+            x_first <= xlim[0]
+            and xlim[1] <= x_last
+            and y_first <= ylim[0]
+            and ylim[1] <= y_last
+            # up to 10% denser or sparser arrows are not noticeable
+            and fabs(new_x_step - x_step) <= 0.1 * x_step
+            and fabs(new_y_step - y_step) <= 0.1 * y_step
+        )
 
     def get_arrows(self):
         """
@@ -144,18 +252,11 @@ class DirectionFieldBuilder:
 
         xlim = self.plot.axes.get_xlim()
         ylim = self.plot.axes.get_ylim()
-        diagonal = np.sqrt((xlim[1] - xlim[0]) ** 2 + (ylim[1] - ylim[0]) ** 2)
+        diagonal = hypot(xlim[1] - xlim[0], ylim[1] - ylim[0])
 
         arrow_len = diagonal * self.settings.get_relative_arrow_length()
         num_arrows = self.settings.num_arrows
-
-        # space between arrows
-        x_step = (xlim[1] - xlim[0]) / num_arrows
-        y_step = (
-            (ylim[1] - ylim[0]) / num_arrows
-            if self.plot.axes.get_aspect() != 1  # if auto axes
-            else x_step  # if equal_axes
-        )
+        x_step, y_step = self.get_arrow_spacing(xlim, ylim)
 
         # margin at the edge off the screen to help with drawing while dragging
         x_margin = (num_arrows // 6) * x_step + (x_step / 2 if num_arrows % 2 == 0 else 0)
@@ -163,23 +264,74 @@ class DirectionFieldBuilder:
         f = lambda n, s: s * (n // s)
         xs = np.arange(f(xlim[0], x_step) - x_margin, xlim[1] + x_step + x_margin, x_step)
         ys = np.arange(f(ylim[0], y_step) - y_margin, ylim[1] + y_step + y_margin, y_step)
+        self.grid_area = (xs[0], xs[-1], ys[0], ys[-1], x_step, y_step)
+
+        key = (self.settings.function_string, xs.tobytes(), ys.tobytes())
+        if self.grid_cache is not None and self.grid_cache[0] == key:
+            centers, vectors = self.grid_cache[1], self.grid_cache[2].copy()
+        else:
+            # same order as iterating over xs and ys in nested loops
+            grid_x, grid_y = np.meshgrid(xs, ys, indexing="ij")
+            try:
+                centers, vectors = self.get_directions_on_grid(grid_x.ravel(), grid_y.ravel())
+            # if the slope function is invalid
+            except NameError:
+                return None
+            self.grid_cache = (key, centers, vectors.copy())
+
+        if len(centers) == 0:
+            return np.empty((4, 0)), centers
+
+        # resize all direction vectors to arrow_len at once
+        vectors *= (arrow_len / np.hypot(vectors[:, 0], vectors[:, 1]))[:, np.newaxis]
+
+        # rows: s1, s2, v1, v2
+        return np.vstack((centers.T - vectors.T / 2, vectors.T)), centers
+
+    def get_directions_on_grid(self, xs, ys):
+        """
+        Returns (centers, directions), both Nx2 arrays, for the points (xs[i], ys[i]) where the function is defined.
+        The function is evaluated on all points at once if it supports numpy arrays, else point by point.
+        """
 
-        arrow_centers = []
-        arrows = []
         try:
-            for x in xs:
-                for y in ys:
-                    if (arrow := self.get_arrow(x, y, arrow_len)) is None:
-                        # the function isn't defined at the point
-                        continue
-                    arrows.append(arrow)
-                    arrow_centers.append((x, y))
-
-            return np.array(arrows).T, arrow_centers
-
-        # if the slope function is invalid
-        except NameError:
-            return None
+            function = create_vectorized_function_from_string(self.settings.function_string)
+            with np.errstate(all="ignore"):
+                slopes = np.broadcast_to(function(xs, ys), xs.shape)
+            if not np.isrealobj(slopes):
+                raise TypeError("complex slope")
+        # the function can't be evaluated on arrays (e.g. uses max(x, y)) --> point by point
+        except Exception:
+            return self.get_directions_point_by_point(xs, ys)
+
+        slopes = slopes.astype(float)
+        directions = np.column_stack((np.ones_like(slopes), slopes))
+        # nan --> not defined, dont draw anything
+        defined = ~np.isnan(slopes)
+        # inf is nonzero/0 (vertical line), but also e.g. log(0) where the scalar function raises
+        # --> let get_direction decide, there are only a few such points
+        for i in np.flatnonzero(np.isinf(slopes)):
+            if (direction := self.get_direction(xs[i], ys[i])) is None:
+                defined[i] = False
+            else:
+                directions[i] = direction
+        centers = np.column_stack((xs, ys))
+        return centers[defined], directions[defined]
+
+    def get_directions_point_by_point(self, xs, ys):
+        """Same as get_directions_on_grid, but calls the slope function for every point separately."""
+
+        centers = []
+        directions = []
+        for x, y in zip(xs, ys):
+            # the function isn't defined at the point, with numpy scalars 0/0 gives nan instead of raising
+            if (direction := self.get_direction(x, y)) is None or direction[1] != direction[1]:
+                continue
+            directions.append(direction)
+            centers.append((x, y))
+        return np.array(centers, dtype=float).reshape(-1, 2), np.array(
+            directions, dtype=float
+        ).reshape(-1, 2)
 
 
 class DirectionFieldPlotter:
@@ -188,40 +340,89 @@ class DirectionFieldPlotter:
     def __init__(self, plot, settings: DirectionFieldSettings):
         self.plot = plot
         self.settings = settings
+        self.quiver = None  # arrows of the last drawn field, moved to the new data if possible
 
     def draw_field(self, arrows, colors):
         """Draws the direction field on the plot."""
 
+        axes = self.plot.axes
+
         # save old lims
-        xlim = self.plot.axes.get_xlim()
-        ylim = self.plot.axes.get_ylim()
+        xlim = axes.get_xlim()
+        ylim = axes.get_ylim()
+
+        # clear the plot (traced curves, mouse line, axes lines), but keep the arrows
+        # self.plot is the empty Line2D created in Canvas.pyplot_code, all drawing reaches the axes through it
+        # --> it is in axes.lines as well and removing it would set its axes to None
+        keep = (self.quiver, self.plot)
+        for artist in [*axes.lines, *axes.collections]:
+            if artist not in keep:
+                artist.remove()
+
+        # like after cla(), the data limits contain only the new arrows --> used by axis("equal")
+        axes.ignore_existing_data_limits = True
+        if self.update_quiver(arrows, colors):
+            axes.update_datalim(self.quiver.XY)  # a new quiver adds only its positions as well
+        else:
+            if self.quiver is not None:
+                self.quiver.remove()
+            self.quiver = self.create_quiver(arrows, colors)
 
-        # clear the plot
-        self.plot.axes.cla()
+        # set old lims
+        axes.set_xlim(xlim)
+        axes.set_ylim(ylim)
 
-        # draw the arrows
-        self.plot.axes.quiver(
+        # draw the grid
+        axes.grid(self.settings.show_grid)
+
+        # draw the axes
+        if self.settings.show_axes:
+            axes.axvline(0, color="black", linewidth=1)
+            axes.axhline(0, color="black", linewidth=1)
+
+    def create_quiver(self, arrows, colors):
+        """Draws the arrows, colors are either a single color or values mapped by the color map."""
+        if isinstance(colors, str):
+            color_args, color_kwargs = (), {"color": colors}
+        else:
+            color_args, color_kwargs = (colors,), {"cmap": self.settings.color_map, "clim": (0, 1)}
+        return self.plot.axes.quiver(
             arrows[0],
             arrows[1],
             arrows[2],
             arrows[3],
+            *color_args,
             angles="xy",
             scale_units="xy",
             scale=1,
             width=self.settings.get_arrow_width(),
-            color=colors,
-            cmap="hsv",
+            **color_kwargs,
         )
 
-        # set old lims
-        self.plot.axes.set_xlim(xlim)
-        self.plot.axes.set_ylim(ylim)
-
-        # draw the grid
-        if self.settings.show_grid:
-            self.plot.axes.grid(True)
+    def update_quiver(self, arrows, colors):
+        """
+        Moves the existing arrows to the new data instead of creating a new quiver.
+        Returns False if that isn't possible, i.e. the number of arrows or the kind of colors changed.
+        """
 
-        # draw the axes
-        if self.settings.show_axes:
-            self.plot.axes.axvline(0, color="black", linewidth=1)
-            self.plot.axes.axhline(0, color="black", linewidth=1)
+        quiver = self.quiver
+        single_color = isinstance(colors, str)
+        if (
+            quiver is None
+            or quiver.N != arrows.shape[1]
+            or single_color != (quiver.get_array() is None)
+        ):
+            return False
+
+        # matplotlib 3.6 Quiver has no setter for the positions, X, Y and XY are read when drawing
+        quiver.X, quiver.Y = arrows[0], arrows[1]
+        quiver.XY = np.column_stack((arrows[0], arrows[1]))
+        quiver.set_offsets(quiver.XY)
+        quiver.width = self.settings.get_arrow_width()
+        if single_color:
+            quiver.set_UVC(arrows[2], arrows[3])
+            quiver.set_color(colors)
+        else:
+            quiver.set_UVC(arrows[2], arrows[3], colors)
+            quiver.set_cmap(self.settings.color_map)
+        return True
@@ -41,6 +41,22 @@ class DirectionFieldSettings:
         self.show_grid = False
         self.show_axes = True
 
+    def copy(self):
+        """Returns a copy of itself"""
+        new = DirectionFieldSettings()
+        new.arrow_length = self.arrow_length
+        new.arrow_width = self.arrow_width
+        new.num_arrows = self.num_arrows
+        new.show_colors = self.show_colors
+        new.color_map = self.color_map
+        new.color_contrast = self.color_contrast
+        new.color_precision = self.color_precision
+        new.function_string = self.function_string
+        new.function = self.function
+        new.show_grid = self.show_grid
+        new.show_axes = self.show_axes
+        return new
+
     def get_relative_arrow_length(self):
         """
         Returns the relative arrow length in respect to diagonal length.
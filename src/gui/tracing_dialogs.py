@@ -101,6 +101,40 @@ class TraceSettingsDialog(QDialog):
         self.button_box.rejected.connect(self.reject)
         layout.addWidget(self.button_box)
 
+    def refresh(self, trace_settings: TraceSettings, slope_function: str, xlim, ylim):
+        """Binds the dialog to new settings and updates all widgets, so that it can be reused."""
+        self.settings = trace_settings
+        self.slope_function_str = slope_function
+        self.xlim = xlim
+        self.ylim = ylim
+        self.selected_color = QColor(self.settings.line_color)
+
+        # basic settings
+        self.slider_w.setValue(self.settings.line_width)
+        self.update_color_box()
+
+        # advanced settings
+        show_advanced = self.settings.show_advanced_settings
+        self.toggle_button.setText(
+            "Hide advanced settings" if show_advanced else "Show advanced settings"
+        )
+        self.label_p.setVisible(show_advanced)
+        self.slider_p.setVisible(show_advanced)
+        self.singularity_strategy_group_box.setVisible(show_advanced)
+        self.slider_p.setValue(self.settings.trace_precision)
+        self.slider_s.setValue(self.settings.singularity_min_slope)
+        self.y_margin_input.setText(str(self.settings.y_margin))
+        self.equation_input.setText(
+            self.settings.singularity_equations.get(self.slope_function_str, "")
+        )
+
+        # singularity detection strategy
+        strategy = self.settings.get_preferred_detection_for(self.slope_function_str)
+        self.radio_automatic_settings.setChecked(strategy == TraceSettings.Strategy.Automatic)
+        self.radio_manual_settings.setChecked(strategy == TraceSettings.Strategy.Manual)
+        self.radio_none_settings.setChecked(strategy == TraceSettings.Strategy.None_)
+        self.switch_detection_settings()
+
     def create_basic_settings(self, layout):
         """Creates the trace-line-width slider and color-picker button."""
         # create the 'trace line width' slider
@@ -1,6 +1,7 @@
-import numpy as np
-from PyQt6.QtGui import QKeyEvent
-from PyQt6.QtCore import Qt
+import os
+from io import BytesIO
+from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QSignalBlocker, QTimer, QThreadPool
 from PyQt6.QtWidgets import (
     QWidget,
     QLabel,
@@ -11,7 +12,6 @@ from PyQt6.QtWidgets import (
     QSlider,
     QLineEdit,
     QMessageBox,
-    QSpacerItem,
     QSizePolicy,
     QFileDialog,
     QCheckBox,
@@ -25,17 +25,69 @@ from src.gui.tracing_dialogs import CoordinateDialog, TraceSettingsDialog
 from src.gui.lock_button import LockButton, LockState
 from src.gui.stop_button import StopButton
 from src.canvas import Canvas
-from src.default_constants import *
+from src.threading.save_figure_task import SaveFigureTask
+from src.math_functions import evaluate_expression
+from src.default_constants import (
+    MIN_MOUSE_LINE_WIDTH,
+    MAX_MOUSE_LINE_WIDTH,
+    DEFAULT_MOUSE_LINE_WIDTH,
+    MIN_MOUSE_LINE_LENGTH,
+    MAX_MOUSE_LINE_LENGTH,
+    DEFAULT_MOUSE_LINE_LENGTH,
+    MIN_ARROW_LENGTH,
+    MAX_ARROW_LENGTH,
+    DEFAULT_ARROW_LENGTH,
+    MIN_ARROW_WIDTH,
+    MAX_ARROW_WIDTH,
+    DEFAULT_ARROW_WIDTH,
+    MIN_NUM_ARROWS,
+    MAX_NUM_ARROWS,
+    DEFAULT_NUM_ARROWS,
+    MIN_COLOR_PRECISION,
+    MAX_COLOR_PRECISION,
+    DEFAULT_COLOR_PRECISION,
+    MIN_COLOR_CONTRAST,
+    MAX_COLOR_CONTRAST,
+    DEFAULT_COLOR_CONTRAST,
+    DEFAULT_COLOR_MAP,
+    AVAILABLE_COLOR_MAPS,
+    DEFAULT_FUNCTION,
+    DEFAULT_XMIN,
+    DEFAULT_XMAX,
+    DEFAULT_YMIN,
+    DEFAULT_YMAX,
+    ROUND_INPUT_LINES,
+)
 
 
 class VisualizerApp(QWidget):
     """Creates the GUI using the PyQt6 library."""
 
     equal_axes = True  # True if the 'Equal axes' checkbox is checked
+    slider_debounce_interval = 60  # ms
+
+    # slider label texts, formatted on every slider tick
+    arrow_length_text = "  &Arrow length: {}".format
+    arrow_width_text = "  &Arrow width: {}".format
+    color_contrast_text = "  &Color contrast: {}".format
+    color_precision_text = "  &Color precision: {}".format
+    mouse_line_length_text = "  &Mouse line length: {}".format
+    mouse_line_width_text = "  &Mouse line width: {}".format
 
     def __init__(self):
         super().__init__()
 
+        # dialogs are created on first use and then reused
+        self.coordinate_dialog = None
+        self.trace_settings_dialog = None
+
+        # field sliders only update the canvas once the slider stops moving
+        self.pending_slider_values = {}  # field setting name -> value
+        self.slider_timer = QTimer(self)
+        self.slider_timer.setSingleShot(True)
+        self.slider_timer.setInterval(self.slider_debounce_interval)
+        self.slider_timer.timeout.connect(self.apply_pending_slider_values)
+
         # call open_wiki function on F1 press
 
         appLayout = QHBoxLayout()
@@ -63,6 +115,13 @@ class VisualizerApp(QWidget):
         sidebar.setMaximumWidth(200)
         self.create_sidebar(sidebar_layout)
 
+        self.create_shortcuts()
+        self.apply_initial_state()
+
+    def apply_initial_state(self):
+        """Configures the canvas according to the initial state of the widgets and draws the first field."""
+        self.checked_equalAxes(self.equalAxes.isChecked())
+
     def stop_background_threads(self):
         """Closes all threads."""
         self.canvas.manager.stop_all_threads()
@@ -81,35 +140,26 @@ class VisualizerApp(QWidget):
             QMessageBox.StandardButton.No,
         )
         if reply == QMessageBox.StandardButton.Yes:
-            self.canvas.redraw()
+            self.canvas.schedule_redraw()
 
-    def keyPressEvent(self, event: QKeyEvent):
+    def create_shortcuts(self):
         """
         Stops tracing when pressing Esc
         Redraws the plot when pressing Ctrl+R
-        Zoom in and out when pressing Ctrl + and Ctrl -
+        Zoom in and out when pressing + and -
         """
-        super().keyPressEvent(event)
-
-        if event.key() == Qt.Key.Key_Escape:
-            self.canvas.stop_tracing()
-            return
-
-        if event.modifiers() == Qt.KeyboardModifier.ControlModifier:
-            if event.key() == Qt.Key.Key_R:
-                self.open_reset_plot_dialog()
-                return
-
-        # Get the physical key's scan code (independent of layout)
-        scan_code = event.nativeScanCode()
-
-        MINUS_KEY = 12
-        PLUS_KEY = 13
-
-        if scan_code == MINUS_KEY:
-            self.canvas.zoom(zoom_in=False)
-        elif scan_code == PLUS_KEY:
-            self.canvas.zoom(zoom_in=True)
+        shortcuts = [
+            (Qt.Key.Key_Escape, self.canvas.stop_tracing),
+            ("Ctrl+R", self.open_reset_plot_dialog),
+            # '=' is the unshifted '+' key on most layouts
+            (Qt.Key.Key_Plus, lambda: self.canvas.zoom(zoom_in=True)),
+            (Qt.Key.Key_Equal, lambda: self.canvas.zoom(zoom_in=True)),
+            (Qt.Key.Key_ZoomIn, lambda: self.canvas.zoom(zoom_in=True)),
+            (Qt.Key.Key_Minus, lambda: self.canvas.zoom(zoom_in=False)),
+            (Qt.Key.Key_ZoomOut, lambda: self.canvas.zoom(zoom_in=False)),
+        ]
+        for key, action in shortcuts:
+            QShortcut(QKeySequence(key), self).activated.connect(action)
 
     def create_canvas(self, layout):
         """Creates the canvas for the graph and overlay buttons."""
@@ -134,15 +184,14 @@ class VisualizerApp(QWidget):
         overlay_layout.addWidget(self.lock_button)
 
         # add space
-        spacer = QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
-        overlay_layout.addItem(spacer)
+        overlay_layout.addStretch()
 
         # add 'stop tracing' button to overlay
         self.stop_tracing_button = StopButton(self)
         self.stop_tracing_button.setVisible(False)
         self.stop_tracing_button.setToolTip(
             "Stop tracing (Esc)"
-        )  # ESC handled in keyPressEvent
+        )  # ESC handled in create_shortcuts
         self.stop_tracing_button.clicked.connect(self.canvas.stop_tracing)
         overlay_layout.addWidget(self.stop_tracing_button)
 
@@ -183,7 +232,7 @@ class VisualizerApp(QWidget):
         self.xmin_input.setMinimumWidth(10)
 
         self.xmin_input.setText(str(DEFAULT_XMIN))
-        self.xmin_input.textChanged.connect(self.update_xmin)
+        self.xmin_input.editingFinished.connect(self.update_lim)
         form = QFormLayout()
         form.addRow(
             "x min:", self.xmin_input
@@ -194,7 +243,7 @@ class VisualizerApp(QWidget):
         self.xmax_input = QLineEdit()
         self.xmax_input.setMinimumWidth(10)
         self.xmax_input.setText(str(DEFAULT_XMAX))
-        self.xmax_input.textChanged.connect(self.update_xmax)
+        self.xmax_input.editingFinished.connect(self.update_lim)
         form = QFormLayout()
         form.addRow(
             "x max:", self.xmax_input
@@ -205,7 +254,7 @@ class VisualizerApp(QWidget):
         self.ymin_input = QLineEdit()
         self.ymin_input.setMinimumWidth(10)
         self.ymin_input.setText(str(DEFAULT_YMIN))
-        self.ymin_input.textChanged.connect(self.update_ymin)
+        self.ymin_input.editingFinished.connect(self.update_lim)
         form = QFormLayout()
         form.addRow(
             "y min:", self.ymin_input
@@ -216,14 +265,24 @@ class VisualizerApp(QWidget):
         self.ymax_input = QLineEdit()
         self.ymax_input.setMinimumWidth(10)
         self.ymax_input.setText(str(DEFAULT_YMAX))
-        self.ymax_input.textChanged.connect(self.update_ymax)
+        self.ymax_input.editingFinished.connect(self.update_lim)
         form = QFormLayout()
         form.addRow(
             "y max:", self.ymax_input
         )  # spaces at the beginning are for additional padding
         layout.addLayout(form)
 
-        self.equalAxes.setChecked(VisualizerApp.equal_axes)
+        # input line -> (axis, index of the lim it controls)
+        self.lim_inputs = {
+            self.xmin_input: ("x", 0),
+            self.xmax_input: ("x", 1),
+            self.ymin_input: ("y", 0),
+            self.ymax_input: ("y", 1),
+        }
+
+        # the canvas is configured in apply_initial_state once all widgets exist
+        with QSignalBlocker(self.equalAxes):
+            self.equalAxes.setChecked(VisualizerApp.equal_axes)
 
         # create the 'center x' button
         self.center_x_button = QPushButton("Center &X")
@@ -274,8 +333,7 @@ class VisualizerApp(QWidget):
         layout.addLayout(form)
 
         # add space
-        spacer = QSpacerItem(0, 10, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Preferred)
-        layout.addItem(spacer)
+        layout.addSpacing(10)
 
         graphLayout = QHBoxLayout()
         self.graph_button = QPushButton("Graph")
@@ -315,7 +373,7 @@ Shortcut: 'Ctrl+T'"""
         layout.addLayout(traceLayout)
 
         # add space
-        layout.addItem(spacer)
+        layout.addSpacing(10)
 
         # arrow settings
         arrow_group = QGroupBox("Direction Field Settings")
@@ -325,7 +383,7 @@ Shortcut: 'Ctrl+T'"""
         # create the 'num arrows' input line and buttons
         self.num_arrows_input = QLineEdit()
         self.num_arrows_input.setText(str(DEFAULT_NUM_ARROWS))
-        self.num_arrows_input.textChanged.connect(self.update_num_arrows)
+        self.num_arrows_input.editingFinished.connect(self.update_num_arrows)
         form = QFormLayout()
         num_arrows_label = QLabel("  Number of arrows:")  # spaces for padding
         num_arrows_label.setToolTip("Number of arrows in the x-direction.")
@@ -392,7 +450,7 @@ Shortcut: 'Ctrl+T'"""
         layout.addWidget(arrow_group)
 
         # add some spacing
-        layout.addItem(spacer)
+        layout.addSpacing(10)
 
         # color settings group
         color_group = QGroupBox("Color Settings")
@@ -458,8 +516,7 @@ Shortcut: 'Ctrl+T'"""
         # create color map dropdown list
         self.color_map = QComboBox()
         self.color_map.setToolTip("Chose a color map.")
-        for color_map in AVAILABLE_COLOR_MAPS:
-            self.color_map.addItem(color_map)
+        self.color_map.addItems(AVAILABLE_COLOR_MAPS)
         self.color_map.setCurrentText(DEFAULT_COLOR_MAP)
         self.color_map.currentTextChanged.connect(self.canvas.set_color_map)
         color_layout.addWidget(self.color_map)
@@ -467,7 +524,7 @@ Shortcut: 'Ctrl+T'"""
         layout.addWidget(color_group)
 
         # add some spacing
-        layout.addItem(spacer)
+        layout.addSpacing(10)
 
         # mouse line settings group
         mouse_line_group = QGroupBox("Mouse Line Settings")
@@ -529,36 +586,85 @@ Shortcut: 'Ctrl+T'"""
         layout.addWidget(mouse_line_group)
 
     def show_save_file_dialog(self):
-        """Opens a dialog to save the current figure as a png or svg file."""
+        """Opens a dialog to save the current figure as an svg, png or pdf file."""
         file_name, _ = QFileDialog.getSaveFileName(
             self,
             "Save File",
             f"",
             "SVG (*.svg);; PNG (*.png);; PDF (*.pdf);; All Files (*)",
         )
-        if file_name:
-            self.canvas.figure.savefig(file_name, bbox_inches="tight")
+        if not file_name:
+            return
+
+        # with a buffer savefig can't take the format from the file name --> pass it explicitly
+        # no extension (e.g. 'All Files') --> save as png and add the suffix
+        file_format = os.path.splitext(file_name)[1][1:].lower()
+        if not file_format:
+            file_format = "png"
+            file_name += ".png"
+        if file_format not in self.canvas.get_supported_filetypes():
+            QMessageBox.critical(
+                self, "Error", f"Could not save the image.\nUnsupported file type '.{file_format}'."
+            )
+            return
+
+        # matplotlib isn't thread safe --> the figure is rendered here in the GUI thread
+        # only writing the file happens in the background
+        buffer = BytesIO()
+        try:
+            self.canvas.figure.savefig(buffer, format=file_format, bbox_inches="tight")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not save the image.\n{e}")
+            return
+        finally:
+            # rendering for the file replaced the background saved for blitting the mouse line
+            self.canvas.manager.request_redraw()
+
+        # the button is enabled again once the file is written
+        self.save_button.setEnabled(False)
+        self.save_figure_task = SaveFigureTask(buffer.getvalue(), file_name)
+        self.save_figure_task.signals.finished.connect(self.on_figure_saved)
+        QThreadPool.globalInstance().start(self.save_figure_task)
+
+    def on_figure_saved(self, error_message):
+        """Enables the save button and shows an error message if saving failed."""
+        self.save_button.setEnabled(True)
+        self.save_figure_task = None
+        if error_message:
+            QMessageBox.critical(self, "Error", f"Could not save the image.\n{error_message}")
 
     def execute_graph_function(self):
         """Plots the function given in the function input line."""
 
         func_str = self.function_input.text()
-        if not self.canvas.set_new_function(func_str):
-            QMessageBox.critical(self, "Error", f"Invalid function.")
+
+        # same function as the one already graphed --> nothing to parse, just refresh the canvas
+        if func_str == self.canvas.manager.field_settings.function_string:
+            self.canvas.manager.request_redraw()
+            return
+
+        # the result is drawn (or an error is shown) once the background calculation finishes
+        self.canvas.set_new_function(func_str)
 
     def checked_equalAxes(self, checked):
         """Turns equal_axes on and off."""
-        VisualizerApp.equal_axes = not VisualizerApp.equal_axes
+        checked = bool(checked)  # stateChanged emits Qt.CheckState values
+        # stateChanged isn't emitted for an unchanged state, only apply_initial_state calls this directly
+        VisualizerApp.equal_axes = checked
         if checked:
             self.canvas.set_equal_axes()
             self.enable_input_lines(False)
         else:
             self.canvas.set_auto_axes()
             self.enable_input_lines(True)
-            self.update_xmin()
-            self.update_xmax()
-            self.update_ymin()
-            self.update_ymax()
+            # apply all four input lines at once --> only one redraw
+            lims = {"x": list(self.canvas.get_xlim()), "y": list(self.canvas.get_ylim())}
+            for input_line, (axis, index) in self.lim_inputs.items():
+                try:
+                    lims[axis][index] = float(input_line.text())
+                except ValueError:  # keep the current lim if the input is not valid
+                    pass
+            self.canvas.set_limits(tuple(lims["x"]), tuple(lims["y"]))
 
     def enable_input_lines(self, enabled):
         """Enables or disables all of the input lines for x and y limits."""
@@ -574,14 +680,24 @@ Shortcut: 'Ctrl+T'"""
     def changed_color_contrast(self):
         """Updates the color contrast according to the slider."""
         color_contrast = self.slider_c.value()
-        self.label_c.setText(f"  &Color contrast: {color_contrast}")
-        self.canvas.set_color_contrast(color_contrast)
+        self.label_c.setText(self.color_contrast_text(color_contrast))
+        self.schedule_slider_update("color_contrast", color_contrast)
 
     def updated_color_precision(self):
         """Updates the color precision according to the slider."""
         color_precision = self.slider_cp.value()
-        self.label_cp.setText(f"  &Color precision: {color_precision}")
-        self.canvas.set_color_precision(color_precision)
+        self.label_cp.setText(self.color_precision_text(color_precision))
+        self.schedule_slider_update("color_precision", color_precision)
+
+    def schedule_slider_update(self, setting, value):
+        """Remembers the new slider value and (re)starts the debounce timer."""
+        self.pending_slider_values[setting] = value
+        self.slider_timer.start()
+
+    def apply_pending_slider_values(self):
+        """Pushes the last values of the moved sliders to the canvas, the field is redrawn only once."""
+        pending, self.pending_slider_values = self.pending_slider_values, {}
+        self.canvas.update_field_settings(**pending)
 
     def checked_grid(self, checked):
         """Turns grid lines on and off."""
@@ -593,12 +709,14 @@ Shortcut: 'Ctrl+T'"""
 
     def clicked_trace_point_button(self):
         """Opens a dialog to input the x and y coordinates of the start point."""
-        dialog = CoordinateDialog(self)
+        if self.coordinate_dialog is None:
+            self.coordinate_dialog = CoordinateDialog(self)
+        dialog = self.coordinate_dialog
         if dialog.exec() == QDialog.DialogCode.Accepted:
             x, y = dialog.get_coordinates()
             try:
-                x = float(eval(x))
-                y = float(eval(y))
+                x = evaluate_expression(x)
+                y = evaluate_expression(y)
                 xlim = self.canvas.get_xlim()
                 ylim = self.canvas.get_ylim()
                 if x < xlim[0] or x > xlim[1]:
@@ -624,117 +742,123 @@ Shortcut: 'Ctrl+T'"""
     def show_trace_settings_dialog(self):
         """Opens a dialog to set the trace settings."""
         new_settings = self.canvas.manager.trace_settings.copy()
-        dialog = TraceSettingsDialog(
-            self,
+        dialog_args = (
             new_settings,
             self.canvas.manager.field_settings.function_string,
             self.canvas.get_xlim(),
             self.canvas.get_ylim(),
         )
+        if self.trace_settings_dialog is None:
+            self.trace_settings_dialog = TraceSettingsDialog(self, *dialog_args)
+        else:
+            self.trace_settings_dialog.refresh(*dialog_args)
+        dialog = self.trace_settings_dialog
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.canvas.manager.trace_settings = new_settings
 
-    def update_xmin(self):
-        """Updates xmin according to the xmin input line."""
-        xmin = self.xmin_input.text()
-        try:
-            xmin = float(xmin)
-        except ValueError:  # don't change anything if the input is not valid
-            return
-        xlim = self.canvas.get_xlim()
-        if xmin == round(xlim[0], ROUND_INPUT_LINES) or xmin >= xlim[1]:
-            return
-        self.canvas.set_xlim((xmin, xlim[1]))
-
-    def update_xmax(self):
-        """Updates xmax according to the xmax input line."""
-        xmax = self.xmax_input.text()
-        try:
-            xmax = float(xmax)
-        except ValueError:  # don't change anything if the input is not valid
+    def update_lim(self):
+        """Updates the lim belonging to the input line which emitted the signal."""
+        input_line = self.sender()
+        # editingFinished is emitted on every focus loss, even if the text wasn't edited
+        if not input_line.isModified():
             return
-        xlim = self.canvas.get_xlim()
-        if xmax == round(xlim[1], ROUND_INPUT_LINES) or xmax <= xlim[0]:
-            return
-        self.canvas.set_xlim((xlim[0], xmax))
+        input_line.setModified(False)
+        self.update_lim_from_input(input_line)
 
-    def update_ymin(self):
-        """Updates ymin according to the ymin input line."""
-        ymin = self.ymin_input.text()
+    def update_lim_from_input(self, input_line):
+        """Updates xmin, xmax, ymin or ymax according to the given input line."""
+        axis, index = self.lim_inputs[input_line]
         try:
-            ymin = float(ymin)
+            value = float(input_line.text())
         except ValueError:  # don't change anything if the input is not valid
             return
-        ylim = self.canvas.get_ylim()
-        if ymin == round(ylim[0], ROUND_INPUT_LINES) or ymin >= ylim[1]:
-            return
-        self.canvas.set_ylim((ymin, ylim[1]))
-
-    def update_ymax(self):
-        """Updates ymax according to the ymax input line."""
-        ymax = self.ymax_input.text()
-        try:
-            ymax = float(ymax)
-        except ValueError:  # don't change anything if the input is not valid
+        lim = list(self.canvas.get_xlim() if axis == "x" else self.canvas.get_ylim())
+        if value == round(lim[index], ROUND_INPUT_LINES):
             return
-        ylim = self.canvas.get_ylim()
-        if ymax == round(ylim[1], ROUND_INPUT_LINES) or ymax <= ylim[0]:
+        # min has to stay below max
+        if (index == 0 and value >= lim[1]) or (index == 1 and value <= lim[0]):
             return
-        self.canvas.set_ylim((ylim[0], ymax))
+        lim[index] = value
+        if axis == "x":
+            xlim, ylim = tuple(lim), self.canvas.get_ylim()
+        else:
+            xlim, ylim = self.canvas.get_xlim(), tuple(lim)
+        # the arrows already drawn cover the new view --> they don't have to be recalculated
+        if self.canvas.manager.field_builder.covers_view(xlim, ylim):
+            self.canvas.set_view_only(xlim, ylim)
+        else:
+            self.canvas.set_limits(xlim, ylim)
 
     def update_displayed_lims(self):
         """Updates all displayed lims according to actual lims."""
         (xmin, xmax), (ymin, ymax) = self.canvas.get_xlim(), self.canvas.get_ylim()
-        self.xmin_input.setText(f"{xmin:.{ROUND_INPUT_LINES}f}")
-        self.xmax_input.setText(f"{xmax:.{ROUND_INPUT_LINES}f}")
-        self.ymin_input.setText(f"{ymin:.{ROUND_INPUT_LINES}f}")
-        self.ymax_input.setText(f"{ymax:.{ROUND_INPUT_LINES}f}")
+        for input_line, value in (
+            (self.xmin_input, xmin),
+            (self.xmax_input, xmax),
+            (self.ymin_input, ymin),
+            (self.ymax_input, ymax),
+        ):
+            text = f"{value:.{ROUND_INPUT_LINES}f}"
+            # only touch the input line if the displayed value changed
+            # and don't let it echo the change back to the canvas
+            if input_line.text() != text:
+                with QSignalBlocker(input_line):
+                    input_line.setText(text)
 
     def update_num_arrows(self):
         """Updates the number of arrows according to the input line."""
-        num_arrows = self.num_arrows_input.text()
+        if not self.num_arrows_input.isModified():
+            return
+        self.num_arrows_input.setModified(False)
         try:
-            num_arrows = int(num_arrows)
+            num_arrows = int(self.num_arrows_input.text())
         except ValueError:  # don't change anything if the input is not valid
             return
-        if num_arrows < MIN_NUM_ARROWS or num_arrows > MAX_NUM_ARROWS:
-            num_arrows = np.clip(num_arrows, MIN_NUM_ARROWS, MAX_NUM_ARROWS)
-            self.num_arrows_input.setText(str(num_arrows))
-        if num_arrows < 1:
-            num_arrows = 1
-            self.num_arrows_input.setText(str(num_arrows))
-        self.canvas.set_num_arrows(num_arrows)
+        self.set_num_arrows(num_arrows)
 
     def add_more_arrows(self):
         """Adds 5 arrows."""
-        self.num_arrows_input.setText(str(int(self.num_arrows_input.text()) + 5))
+        self.set_num_arrows(self.canvas.manager.field_settings.num_arrows + 5)
 
     def remove_some_arrows(self):
         """Removes 5 arrows."""
-        self.num_arrows_input.setText(str(int(self.num_arrows_input.text()) - 5))
+        self.set_num_arrows(self.canvas.manager.field_settings.num_arrows - 5)
+
+    def set_num_arrows(self, num_arrows):
+        """Clamps the number of arrows, shows it in the input line and sends it to the canvas."""
+        num_arrows = (
+            MIN_NUM_ARROWS
+            if num_arrows < MIN_NUM_ARROWS
+            else MAX_NUM_ARROWS if num_arrows > MAX_NUM_ARROWS else num_arrows
+        )
+        text = str(num_arrows)
+        if self.num_arrows_input.text() != text:
+            with QSignalBlocker(self.num_arrows_input):
+                self.num_arrows_input.setText(text)
+        self.canvas.set_num_arrows(num_arrows)
 
     def changed_arrow_length(self):
         """Updates the arrow length according to the slider."""
         arrow_length = self.slider_a.value()
-        self.label_a.setText(f"  &Arrow length: {arrow_length}")
-        self.canvas.set_arrow_length(arrow_length)
+        self.label_a.setText(self.arrow_length_text(arrow_length))
+        self.schedule_slider_update("arrow_length", arrow_length)
 
     def changed_arrow_width(self):
         """Updates the arrow width according to the slider."""
         arrow_width = self.slider_aw.value()
-        self.label_aw.setText(f"  &Arrow width: {arrow_width}")
-        self.canvas.set_arrow_width(arrow_width)
+        self.label_aw.setText(self.arrow_width_text(arrow_width))
+        self.schedule_slider_update("arrow_width", arrow_width)
 
     def changed_mouse_line_width(self):
         """Updates the mouse line width according to the slider."""
         width = self.slider_mw.value()
-        self.label_mw.setText(f"  &Mouse line width: {width}")
+        self.label_mw.setText(self.mouse_line_width_text(width))
         self.canvas.set_mouse_line_width(width)
 
     def changed_mouse_line_length(self):
         """Updates the mouse line length according to the slider."""
         length = self.slider_ml.value()
-        self.label_ml.setText(f"  &Mouse line length: {length}")
+        self.label_ml.setText(self.mouse_line_length_text(length))
         self.canvas.set_mouse_line_length(length)
 
     def checked_mouseLine(self, checked):
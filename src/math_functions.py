@@ -1,3 +1,7 @@
+import ast
+from functools import lru_cache
+import numpy as np
+
 # import standard function from math
 from math import (
     sin,
@@ -35,7 +39,141 @@ asec = lambda x: acos(1 / x)
 acsc = lambda x: asin(1 / x)
 sign = lambda x: int((x > 0)) - int((x < 0))
 
+# the only names visible to slope functions --> one small dict lookup per name and no access to builtins
+math_namespace = {
+    "__builtins__": {},
+    "sin": sin,
+    "cos": cos,
+    "tan": tan,
+    "asin": asin,
+    "acos": acos,
+    "atan": atan,
+    "sinh": sinh,
+    "cosh": cosh,
+    "tanh": tanh,
+    "asinh": asinh,
+    "acosh": acosh,
+    "atanh": atanh,
+    "exp": exp,
+    "log": log,
+    "log2": log2,
+    "log10": log10,
+    "sqrt": sqrt,
+    "pow": pow,
+    "fabs": fabs,
+    "floor": floor,
+    "ceil": ceil,
+    "pi": pi,
+    "e": e,
+    "ln": ln,
+    "abs": abs,
+    "cot": cot,
+    "sec": sec,
+    "csc": csc,
+    "acot": acot,
+    "asec": asec,
+    "acsc": acsc,
+    "sign": sign,
+    "max": max,
+    "min": min,
+    "round": round,
+    "int": int,
+    "float": float,
+}
+
 
+@lru_cache(maxsize=64)
 def create_function_from_string(string):
-    """Receives a string that should be a mathematical function f(x,y) and returns a lambda function."""
-    return eval(f"lambda x, y: {string}")
+    """
+    Receives a string that should be a mathematical function f(x,y) and returns a lambda function.
+    The lambda is cached, so redraws and traces of the same function don't compile it again.
+    """
+    validate_function_string(string)
+    return eval(compile(f"lambda x, y: {string}", "<function>", "eval"), math_namespace)
+
+
+# numpy counterparts of the functions above, used to evaluate a slope function on a whole grid at once
+# builtins are left out on purpose --> e.g. max(x, y) raises NameError and the scalar version is used
+numpy_namespace = {
+    "__builtins__": {},
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "asinh": np.arcsinh,
+    "acosh": np.arccosh,
+    "atanh": np.arctanh,
+    "exp": np.exp,
+    "log": np.log,
+    "log2": np.log2,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "pow": np.power,
+    "fabs": np.fabs,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "pi": pi,
+    "e": e,
+    "ln": np.log,
+    "abs": np.fabs,
+    "cot": lambda x: np.cos(x) / np.sin(x),
+    "sec": lambda x: 1 / np.cos(x),
+    "csc": lambda x: 1 / np.sin(x),
+    "acot": lambda x: pi / 2 - np.arctan(x),
+    "asec": lambda x: np.arccos(1 / x),
+    "acsc": lambda x: np.arcsin(1 / x),
+    "sign": np.sign,
+}
+
+# what evaluating a slope function can raise: division by zero (FloatingPointError for numpy scalars),
+# overflow, math domain errors and comparing or converting complex results
+evaluation_errors = (ArithmeticError, ValueError, TypeError)
+
+# names a slope function may use, everything else (e.g. __import__ or open) is rejected before eval
+allowed_names = {"x", "y"} | (math_namespace.keys() - {"__builtins__"})
+# names an expression without variables (e.g. a coordinate) may use
+allowed_expression_names = allowed_names - {"x", "y"}
+
+
+def validate_function_string(string, names=allowed_names):
+    """Raises SyntaxError if the string is not an expression using only the given names."""
+    for node in ast.walk(ast.parse(string, mode="eval")):
+        if isinstance(node, ast.Attribute):
+            raise SyntaxError(f"attribute access is not allowed: '{node.attr}'")
+        if isinstance(node, ast.Name) and node.id not in names:
+            raise SyntaxError(f"unknown name: '{node.id}'")
+
+
+@lru_cache(maxsize=64)
+def create_vectorized_function_from_string(string):
+    """
+    Receives a string that should be a mathematical function f(x,y) and returns a lambda function
+    which can be evaluated on numpy arrays of x and y values.
+    """
+    validate_function_string(string)
+    return eval(f"lambda x, y: {string}", numpy_namespace)
+
+
+@lru_cache(maxsize=64)
+def compile_expression(string):
+    """Compiles a mathematical expression without variables, repeated expressions are compiled only once."""
+    validate_function_string(string, allowed_expression_names)
+    return compile(string, "<expression>", "eval")
+
+
+def evaluate_expression(string):
+    """Receives a string that should be a mathematical expression (e.g. 'pi/2') and returns its value as a float."""
+    # plain numbers are the common case --> no need to compile anything
+    try:
+        value = float(string)
+        # 'inf' and 'nan' are not valid expressions
+        if np.isfinite(value):
+            return value
+    except ValueError:
+        pass
+    return float(eval(compile_expression(string), math_namespace))
@@ -1,5 +1,5 @@
 from matplotlib.collections import LineCollection
-from PyQt6.QtCore import QObject, QMutex
+from PyQt6.QtCore import pyqtSignal, QObject, QMutex
 from typing import List, Tuple
 from src.tracing.trace_settings import TraceSettings
 
@@ -7,6 +7,9 @@ from src.tracing.trace_settings import TraceSettings
 class DrawingManager(QObject):
     """Manages drawing curves in a separate thread."""
 
+    # emitted after new curves were added to the plot, the canvas is repainted in the main thread
+    curves_added = pyqtSignal()
+
     def __init__(self, plot):
         super().__init__()
         self.plot = plot
@@ -37,15 +40,18 @@ class DrawingManager(QObject):
         if not curves:
             return
 
+        # group the curves by color and width --> one collection per style instead of one per curve
+        # keeps the number of artists matplotlib has to draw low during long traces
+        curves_by_style = {}
         for settings, curve in curves:
-            # get color and width
-            color = settings.line_color
-            width = settings.get_line_width()
+            style = (settings.line_color, settings.get_line_width())
+            curves_by_style.setdefault(style, []).append(curve)
 
-            # draw the curve
-            lc = LineCollection([curve], color=color, linewidth=width)
+        # draw the curves
+        for (color, width), style_curves in curves_by_style.items():
+            lc = LineCollection(style_curves, color=color, linewidth=width)
             self.plot.axes.add_collection(lc)
-        self.plot.figure.canvas.draw()
+        self.curves_added.emit()
 
     def run(self):
         """Periodically draws the curves from the queue"""
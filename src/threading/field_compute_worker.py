@@ -0,0 +1,67 @@
+import numpy as np
+from PyQt6.QtCore import pyqtSignal, pyqtSlot, QObject
+
+from src.math_functions import create_function_from_string
+from src.direction_field.direction_field_settings import DirectionFieldSettings
+from src.direction_field.direction_field_builder import DirectionFieldBuilder
+
+
+class FieldComputeWorker(QObject):
+    """Validates a new slope function and calculates its direction field in a separate thread."""
+
+    # slope function string
+    compute_requested = pyqtSignal(str)
+    # slope function string, FieldComputeResult or None if the function is invalid
+    finished = pyqtSignal(str, object)
+
+    def __init__(self, plot, field_settings: DirectionFieldSettings):
+        super().__init__()
+        self.plot = plot
+        self.field_settings = field_settings
+
+    @pyqtSlot(str)
+    def compute(self, function_string: str):
+        """Calculates arrows and colors for the given slope function and emits 'finished'."""
+
+        # check if the new function is syntactically correct
+        try:
+            function = create_function_from_string(function_string)
+        except SyntaxError:
+            self.finished.emit(function_string, None)
+            return
+
+        settings = self.field_settings.copy()
+        settings.function = function
+        settings.function_string = function_string
+
+        xlim = self.plot.axes.get_xlim()
+        ylim = self.plot.axes.get_ylim()
+        builder = DirectionFieldBuilder(self.plot, settings)
+
+        # numpy's error state is per thread --> same as np.seterr in the GUI thread
+        # nonzero/0 has to raise FloatingPointError to get a vertical arrow instead of inf
+        with np.errstate(divide="raise", invalid="ignore"):
+            # if the function is invalid
+            if (result := builder.get_arrows()) is None:
+                self.finished.emit(function_string, None)
+                return
+
+            arrows, arrow_centers = result
+            colors = builder.get_colors(arrow_centers)
+
+        self.finished.emit(
+            function_string,
+            FieldComputeResult(settings, xlim, ylim, arrows, colors, builder.directions_cache),
+        )
+
+
+class FieldComputeResult:
+    """Direction field calculated by the FieldComputeWorker."""
+
+    def __init__(self, settings: DirectionFieldSettings, xlim, ylim, arrows, colors, directions_cache):
+        self.settings = settings
+        self.xlim = xlim
+        self.ylim = ylim
+        self.arrows = arrows
+        self.colors = colors
+        self.directions_cache = directions_cache
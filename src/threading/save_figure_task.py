@@ -0,0 +1,31 @@
+from PyQt6.QtCore import pyqtSignal, QObject, QRunnable
+
+
+class SaveFigureSignals(QObject):
+    """Signals of the SaveFigureTask, QRunnable itself can't emit signals."""
+
+    # error message, empty if the figure was saved successfully
+    finished = pyqtSignal(str)
+
+
+class SaveFigureTask(QRunnable):
+    """
+    Writes an already rendered figure to a file in a thread from the QThreadPool.
+    Matplotlib isn't thread safe --> the figure has to be rendered in the GUI thread.
+    """
+
+    def __init__(self, data: bytes, file_name):
+        super().__init__()
+        self.data = data
+        self.file_name = file_name
+        self.signals = SaveFigureSignals()
+
+    def run(self):
+        """Writes the file and emits 'finished'."""
+        try:
+            with open(self.file_name, "wb") as file:
+                file.write(self.data)
+        except OSError as e:
+            self.signals.finished.emit(str(e))
+            return
+        self.signals.finished.emit("")
@@ -102,6 +102,8 @@ class TraceManager:
         self.drawing_manager_thread = QThread()
         self.drawing_manager = DrawingManager(plot)
         self.drawing_manager.moveToThread(self.drawing_manager_thread)
+        # queued to the main thread --> curves from several batches are painted by a single draw_idle
+        self.drawing_manager.curves_added.connect(plot.figure.canvas.draw_idle)
         self.drawing_manager_thread.started.connect(self.drawing_manager.run)
         self.drawing_manager_thread.finished.connect(self.drawing_manager.deleteLater)
         self.drawing_manager_thread.start()
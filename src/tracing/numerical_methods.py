@@ -2,27 +2,31 @@ from typing import Callable, Tuple
 from math import fabs
 
 
-def newtons_method(function: Callable[[float], float], x0, precision=1e-5):
-    """Newton's method for finding roots of a function."""
-
-    def relative_error(xnew, xlast):
-        return fabs((xnew - xlast) / xnew)
-
-    def derivative(function: Callable[[float], float], x) -> float:
-        dx = 1e-12
-        return (function(x + dx) - function(x)) / dx
+def newtons_method(function: Callable[[float], float], x0, precision=1e-5, tolerance=1e-12):
+    """
+    Newton's method for finding roots of a function.
+    Stops when |function(x)| < tolerance, when the step is below 10 * precision * |x| + tolerance or after 10 steps.
+    """
 
     xlast = x0
+    f_xlast = function(xlast)  # reused by the derivative --> two evaluations per step instead of three
     i = 0
-    while True:
-        xnew = xlast - function(xlast) / derivative(function, xlast)
+    # a negligible residual (e.g. x0 is already on the root) --> no need for another step
+    while not fabs(f_xlast) < tolerance:
+        # forward difference, a step below sqrt(machine epsilon) would only measure rounding errors
+        dx = max(1e-8, 1e-8 * fabs(xlast))
+        derivative = (function(xlast + dx) - f_xlast) / dx
+        xnew = xlast - f_xlast / derivative
         if xnew == 0:
             return xnew
-        error = relative_error(xnew, xlast)
+        # relative step test with an absolute floor --> also works for roots at (or close to) zero
+        # convergence is quadratic --> after a step of 10 * precision the remaining error is far below precision
+        step = fabs(xnew - xlast)
         xlast = xnew
         i = i + 1
-        if error < precision or i > 30:
+        if step < 10 * precision * fabs(xnew) + tolerance or i >= 10:
             break
+        f_xlast = function(xlast)
     return xlast
 
 
@@ -1,29 +1,32 @@
 from typing import Tuple, Iterator
+from math import fabs, hypot
 import numpy as np
 
-from src.math_functions import *
 from src.default_constants import (
     TRACE_NUM_SEGMENTS_IN_DIAGONAL,
 )
 
 
-from src.math_functions import create_function_from_string
+from src.math_functions import create_function_from_string, evaluation_errors, sign
 from src.tracing.numerical_methods import find_first_intersection
 from src.tracing.trace_settings import TraceSettings
 
 # helper functions for working with vectors
+# vectors are passed as two floats, 2-element numpy arrays cost more to create than to compute with
 
 
-def resize_vector(vector, length):
-    return vector / np.linalg.norm(vector) * length
+def resize_vector(vx, vy, length) -> Tuple[float, float]:
+    scale = length / hypot(vx, vy)
+    return vx * scale, vy * scale
 
 
-def resize_vector_by_x(vector, x):
-    return vector / fabs(vector[0]) * x
+def resize_vector_by_x(vx, vy, x) -> Tuple[float, float]:
+    scale = x / fabs(vx)
+    return vx * scale, vy * scale
 
 
-def vector_length(vector):
-    return np.linalg.norm(vector)
+def vector_length(vx, vy):
+    return hypot(vx, vy)
 
 
 def round_if_close_to_zero(x, epsilon=1e-9):
@@ -48,6 +51,54 @@ class SolutionTracer:
         Infinite = 2
         Continue = 3
 
+    # (sign(der), direction, sign(n_der2), sign(n_der)) -> (strategy if can continue, strategy otherwise)
+    # der is the slope before the singularity, n_der and n_der2 are the derivatives behind it
+    # shapes not listed here (some value is zero) --> continue if possible, otherwise infinite
+    singularity_outcomes = {
+        # convex up - forward
+        (1, Direction.Right, 1, -1): (Strategy.Infinite, Strategy.Infinite),  # convex down
+        (1, Direction.Right, 1, 1): (Strategy.Continue, Strategy.Stop),  # convex up
+        (1, Direction.Right, -1, 1): (Strategy.Continue, Strategy.Infinite),  # concave up
+        (1, Direction.Right, -1, -1): (Strategy.Stop, Strategy.Stop),  # concave down
+        # concave down - forward
+        (-1, Direction.Right, 1, -1): (Strategy.Continue, Strategy.Infinite),  # convex down
+        (-1, Direction.Right, 1, 1): (Strategy.Stop, Strategy.Stop),  # convex up
+        (-1, Direction.Right, -1, 1): (Strategy.Infinite, Strategy.Infinite),  # concave up
+        (-1, Direction.Right, -1, -1): (Strategy.Continue, Strategy.Stop),  # concave down
+        # concave up - backward
+        (1, Direction.Left, 1, -1): (Strategy.Stop, Strategy.Stop),  # convex down
+        (1, Direction.Left, 1, 1): (Strategy.Continue, Strategy.Infinite),  # convex up
+        (1, Direction.Left, -1, 1): (Strategy.Continue, Strategy.Stop),  # concave up
+        (1, Direction.Left, -1, -1): (Strategy.Infinite, Strategy.Infinite),  # concave down
+        # convex down - backward
+        (-1, Direction.Left, 1, -1): (Strategy.Continue, Strategy.Stop),  # convex down
+        (-1, Direction.Left, 1, 1): (Strategy.Infinite, Strategy.Infinite),  # convex up
+        (-1, Direction.Left, -1, 1): (Strategy.Stop, Strategy.Stop),  # concave up
+        (-1, Direction.Left, -1, -1): (Strategy.Continue, Strategy.Infinite),  # concave down
+    }
+
+    # fixed set of attributes --> no per-instance __dict__, trace() reads them on every step
+    __slots__ = (
+        "settings",
+        "detection_strategy",
+        "slope_func",
+        "singularity_eq",
+        "xlim",
+        "ylim",
+        "diagonal_len",
+        "max_line_segment_length",
+        "min_step",
+        "max_step",
+        "singularity_alert_distance",
+        "max_dx",
+        "sing_dx",
+        # state of the current trace
+        "direction",
+        "slope",
+        "vector",
+        "sing_diff",
+    )
+
     def __init__(self, settings: TraceSettings, slope_function_string: str, xlim, ylim):
         self.settings = settings
         self.detection_strategy = settings.get_preferred_detection_for(slope_function_string)
@@ -65,26 +116,49 @@ class SolutionTracer:
         # calculate diagonal length and max line segment length
         self.xlim = xlim
         self.ylim = ylim
-        self.diagonal_len = np.sqrt((xlim[1] - xlim[0]) ** 2 + (ylim[1] - ylim[0]) ** 2)
+        self.diagonal_len = hypot(xlim[1] - xlim[0], ylim[1] - ylim[0])
         self.max_line_segment_length = self.diagonal_len / TRACE_NUM_SEGMENTS_IN_DIAGONAL
 
-    def is_monotonous_on(self, start, diff_vector, num_points) -> bool:
+        # step sizes depend only on the settings and the view --> calculate them once, not for every trace
+        # manual detection
+        self.min_step = self.diagonal_len / 10 ** settings.get_trace_min_step_granularity()
+        self.max_step = self.diagonal_len / 10 ** settings.get_trace_max_step_granularity()
+        self.singularity_alert_distance = (
+            self.diagonal_len / 10 ** settings.get_singularity_alert_dist_granularity()
+        )
+
+        # max_dx is the maximum step size in x direction
+        self.max_dx = (xlim[1] - xlim[0]) / 10 ** settings.get_trace_dx_granularity()
+        # sing_dx is the step size used when a singularity is detected in auto-detection mode
+        self.sing_dx = min(1e-6, self.max_dx / 1000)
+
+        # state of the current trace, set by trace() and the singularity detection
+        self.direction = self.Direction.Right
+        self.slope = 0.0
+        self.vector = (0.0, 0.0)
+        # distance to the closest singularity, only calculated with manual detection
+        self.sing_diff = (0.0, 0.0)
+
+    def is_monotonous_on(self, x, y, diff_x, diff_y, num_points) -> bool:
         """
-        Checks if the slope function is monotonous on the line segment from start to start + diff_vector.
+        Checks if the slope function is monotonous on the line segment from (x, y) to (x + diff_x, y + diff_y).
         Checks the slope at num_points equidistant points on the segment.
+        The slope at (x, y) has to be stored in self.slope.
         """
 
-        sgn = sign(self.slope_func(start[0], start[1]))
-        diff = diff_vector / num_points
+        slope_func = self.slope_func
+        sgn = sign(self.slope)
+        dx, dy = diff_x / num_points, diff_y / num_points
 
         # try because slope_func is unsafe
         try:
             for _ in range(num_points):
-                start += diff
-                if sign(self.slope_func(start[0], start[1])) != sgn:
+                x += dx
+                y += dy
+                if sign(slope_func(x, y)) != sgn:
                     return False
             return True
-        except:
+        except evaluation_errors:
             return False
 
     def should_stop_if_y_out_of_bounds(self, y) -> bool:
@@ -103,7 +177,10 @@ class SolutionTracer:
         return dist > (self.ylim[1] - self.ylim[0]) * self.settings.y_margin
 
     def possible_singularity_at(self, x, y) -> bool:
-        """Checks if there might a singularity close to the point (x, y)."""
+        """
+        Checks if there might a singularity close to the point (x, y).
+        The slope at (x, y) has to be stored in self.slope.
+        """
 
         # if no detection --> return False
         if self.detection_strategy == TraceSettings.Strategy.None_:
@@ -111,39 +188,34 @@ class SolutionTracer:
 
         # if automatic detection is enabled, check if the slope is too steep
         if self.detection_strategy == TraceSettings.Strategy.Automatic:
-            try:  # slope_func is unsafe
-                return fabs(self.slope_func(x, y)) > self.settings.singularity_min_slope
-            except:
-                # probably division by zero --> close to singularity
-                return True
+            return fabs(self.slope) > self.settings.singularity_min_slope
 
         # manual detection --> singularity_eq should be set
         assert self.singularity_eq is not None
 
         try:
             singularity = find_first_intersection(self.singularity_eq, self.slope, x, y)
-            diff = np.array([singularity[0] - x, singularity[1] - y])
-        except:
+            diff_x, diff_y = singularity[0] - x, singularity[1] - y
+        except evaluation_errors:
             # newtons method probably failed --> no singularity close
             # but still set a valid sing_diff, it is used during the iteration
             # --> set sing_diff to a large vector in the correct direction
-            self.sing_diff = resize_vector(self.vector, 10 * self.singularity_alert_distance)
+            self.sing_diff = resize_vector(*self.vector, 10 * self.singularity_alert_distance)
             if fabs(self.sing_diff[0]) < self.max_dx:
-                self.sing_diff = resize_vector_by_x(self.sing_diff, self.max_dx)
+                self.sing_diff = resize_vector_by_x(*self.sing_diff, self.max_dx)
             return False
 
-        diff = np.array([singularity[0] - x, singularity[1] - y])
-        self.sing_diff = diff
+        self.sing_diff = (diff_x, diff_y)
 
         # if the singularity is close enough, return True
-        if vector_length(diff) < self.singularity_alert_distance:
+        if vector_length(diff_x, diff_y) < self.singularity_alert_distance:
             return True
 
         # very high slope --> the diff will probably be x=0 and y>>x
         if (
             not (self.ylim[0] <= y <= self.ylim[1])
             and fabs(self.slope) > 1e9
-            and fabs(diff[0]) < self.max_dx
+            and fabs(diff_x) < self.max_dx
         ):
             return True
 
@@ -156,13 +228,14 @@ class SolutionTracer:
         - CONTINUE = cautiously continue, your next step should be safe
         - STOP = stop tracing, a STOP singularity was detected
         - INFINITE = an infinite singularity was detected, the line should go off screen
+        The slope at (x, y) has to be stored in self.slope.
         """
 
         # manual detection & if y is out of bounds --> STOP
         if self.detection_strategy == TraceSettings.Strategy.Manual and (
             y < self.ylim[0] or y > self.ylim[1]
         ):
-            if fabs(self.slope_func(x, y)) > 1:
+            if fabs(self.slope) > 1:
                 return self.Strategy.Infinite
             return self.Strategy.Stop
 
@@ -174,46 +247,51 @@ class SolutionTracer:
 
         # this is in a try block because slope_func is unsafe
         try:
-            der = self.slope_func(x, y)
-            der = round_if_close_to_zero(der)
+            der = round_if_close_to_zero(self.slope)
 
             # auto detection --> use sing_dx to determine size of diff
             if self.detection_strategy == TraceSettings.Strategy.Automatic:
-                diff = np.array([self.sing_dx, self.sing_dx * der]) * self.direction
+                diff_x = self.sing_dx * self.direction
+                diff_y = self.sing_dx * der * self.direction
 
             # manual detection --> use distance to singularity to determine size of diff
             elif self.detection_strategy == TraceSettings.Strategy.Manual:
                 # sing_diff = distance to singularity
                 # jump to the other side
-                if vector_length(self.sing_diff) > self.min_step:
-                    diff = self.sing_diff
+                if vector_length(*self.sing_diff) > self.min_step:
+                    diff_x, diff_y = self.sing_diff
                 else:
-                    diff = resize_vector(np.array([1, der]), self.min_step)
+                    diff_x, diff_y = resize_vector(1, der, self.min_step)
 
-                # correct the direction
-                if sign(diff[0]) != sign(self.vector[0]):
-                    diff *= -1
+                # correct the direction, the x part of the vector is never zero
+                if not diff_x * self.vector[0] > 0:
+                    diff_x, diff_y = -diff_x, -diff_y
                 # if the jump is too big, resize it
-                if fabs(diff[0]) > self.sing_dx:
-                    diff = resize_vector_by_x(diff, self.sing_dx)
-                if vector_length(diff) > self.max_step:
-                    diff = resize_vector(diff, self.max_step)
-                diff = 2 * diff
+                if fabs(diff_x) > self.sing_dx:
+                    diff_x, diff_y = resize_vector_by_x(diff_x, diff_y, self.sing_dx)
+                if vector_length(diff_x, diff_y) > self.max_step:
+                    diff_x, diff_y = resize_vector(diff_x, diff_y, self.max_step)
+                diff_x, diff_y = 2 * diff_x, 2 * diff_y
 
             else:
                 raise ValueError("Invalid detection strategy")  # should never happen
 
             # jump to the other side of the singularity (hopefully)
-            nx, ny = x + diff[0], y + diff[1]
+            nx, ny = x + diff_x, y + diff_y
 
             # calculate first and second derivative at (nx, ny)
-            sdx = 1e-15
             n_der = self.slope_func(nx, ny)
             n_der = round_if_close_to_zero(n_der)
-            n_der2 = (self.slope_func(nx + sdx, ny + sdx * n_der) - n_der) / sdx
+            # central difference along the solution, the step is large enough not to be rounding noise
+            # but stays below half of the jump --> both points are on the far side of the singularity
+            sdx = min(6e-6 * max(1, fabs(nx)), fabs(diff_x) / 2)
+            n_der2 = (
+                self.slope_func(nx + sdx, ny + sdx * n_der)
+                - self.slope_func(nx - sdx, ny - sdx * n_der)
+            ) / (2 * sdx)
             n_der2 = round_if_close_to_zero(n_der2)
 
-        except:
+        except evaluation_errors:
             # either division-by-zero, math-domain-error or the function is not valid
             # --> something is wrong, stop tracing
             return self.Strategy.Stop
@@ -221,7 +299,7 @@ class SolutionTracer:
         # helper function to determine if the tracing can continue
         def can_continue():
             if self.detection_strategy == TraceSettings.Strategy.Manual:
-                return vector_length(self.sing_diff) > self.min_step
+                return vector_length(*self.sing_diff) > self.min_step
 
             # if the slope is very steep, there is almost certainly a singularity --> STOP
             if fabs(der) > 1e6:
@@ -230,61 +308,22 @@ class SolutionTracer:
             # this is automatic detection --> steep slope
             # if the function is not monotonic in the neighborhood of this suspected singularity
             # there is most probably a singularity --> STOP
-            vector = resize_vector_by_x(diff, self.sing_dx)
-            return self.is_monotonous_on(np.array([x, y]), 2 * vector, 10)
-
-        # convex up - forward
-        if der > 0 and self.direction == self.Direction.Right:
-            if n_der2 > 0 and n_der < 0:  # convex down
-                return self.Strategy.Infinite
-            if n_der2 > 0 and n_der > 0:  # convex up
-                return self.Strategy.Continue if can_continue() else self.Strategy.Stop
-            if n_der2 < 0 and n_der > 0:  # concave up
-                return self.Strategy.Continue if can_continue() else self.Strategy.Infinite
-            if n_der2 < 0 and n_der < 0:  # concave down
-                return self.Strategy.Stop
-
-        # concave down - forward
-        if der < 0 and self.direction == self.Direction.Right:
-            if n_der2 > 0 and n_der < 0:  # convex down
-                return self.Strategy.Continue if can_continue() else self.Strategy.Infinite
-            if n_der2 > 0 and n_der > 0:  # convex up
-                return self.Strategy.Stop
-            if n_der2 < 0 and n_der > 0:  # concave up
-                return self.Strategy.Infinite
-            if n_der2 < 0 and n_der < 0:  # concave down
-                return self.Strategy.Continue if can_continue() else self.Strategy.Stop
+            vx, vy = resize_vector_by_x(diff_x, diff_y, self.sing_dx)
+            return self.is_monotonous_on(x, y, 2 * vx, 2 * vy, 10)
 
-        # concave up - backward
-        if der > 0 and self.direction == self.Direction.Left:
-            if n_der2 > 0 and n_der < 0:  # convex down
-                return self.Strategy.Stop
-            if n_der2 > 0 and n_der > 0:  # convex up
-                return self.Strategy.Continue if can_continue() else self.Strategy.Infinite
-            if n_der2 < 0 and n_der > 0:  # concave up
-                return self.Strategy.Continue if can_continue() else self.Strategy.Stop
-            if n_der2 < 0 and n_der < 0:  # concave down
-                return self.Strategy.Infinite
-
-        # convex down - backward
-        if der < 0 and self.direction == self.Direction.Left:
-            if n_der2 > 0 and n_der < 0:  # convex down
-                return self.Strategy.Continue if can_continue() else self.Strategy.Stop
-            if n_der2 > 0 and n_der > 0:  # convex up
-                return self.Strategy.Infinite
-            if n_der2 < 0 and n_der > 0:  # concave up
-                return self.Strategy.Stop
-            if n_der2 < 0 and n_der < 0:  # concave down
-                return self.Strategy.Continue if can_continue() else self.Strategy.Infinite
-
-        return self.Strategy.Continue if can_continue() else self.Strategy.Infinite
+        # look up what to do based on the shape of the function behind the singularity
+        key = (sign(der), self.direction, sign(n_der2), sign(n_der))
+        if_can_continue, otherwise = self.singularity_outcomes.get(
+            key, (self.Strategy.Continue, self.Strategy.Infinite)
+        )
+        if if_can_continue == otherwise:
+            return otherwise
+        return if_can_continue if can_continue() else otherwise
 
-    def should_yield_point(
-        self, point, current_line_segment_length, line_segment_start
-    ) -> bool:
-        """Determines if a new point should be yielded based on the point position and the current line segment."""
-        start_in_screen = self.ylim[0] < line_segment_start[1] < self.ylim[1]
-        end_in_screen = self.ylim[0] < point[1] < self.ylim[1]
+    def should_yield_point(self, y, current_line_segment_length, line_segment_start_y) -> bool:
+        """Determines if a new point should be yielded based on the point y position and the current line segment."""
+        start_in_screen = self.ylim[0] < line_segment_start_y < self.ylim[1]
+        end_in_screen = self.ylim[0] < y < self.ylim[1]
 
         if start_in_screen and end_in_screen:
             return current_line_segment_length > self.max_line_segment_length
@@ -294,11 +333,7 @@ class SolutionTracer:
             return True
 
         # start and end are out of screen
-        dist = (
-            fabs(point[1] - self.ylim[0])
-            if point[1] < self.ylim[0]
-            else fabs(point[1] - self.ylim[1])
-        )
+        dist = fabs(y - self.ylim[0]) if y < self.ylim[0] else fabs(y - self.ylim[1])
         length_needed = max(dist / 2, self.max_line_segment_length)
         return current_line_segment_length > length_needed
 
@@ -306,15 +341,18 @@ class SolutionTracer:
         """
         Goes off to infinity (and possibly stops) from (x0, y0) in the given direction.
         This can be either an INFINITE or a STOP singularity.
+        The slope at (x0, y0) has to be stored in self.slope.
         """
 
         assert direction in [self.Direction.Up, self.Direction.Down]
 
-        point = np.array([x0, y0])
-        original_dist = vector_length(self.sing_diff)
+        px, py = x0, y0
+        original_dist = vector_length(*self.sing_diff)
+        # slope at the current point, each step reuses the slope calculated at its end by the previous step
+        der = self.slope
 
         current_line_segment_length = 0
-        line_segment_start = point.copy()
+        line_segment_start_y = py
 
         def get_y_step(y):
             if self.ylim[0] <= y <= self.ylim[1]:
@@ -326,68 +364,63 @@ class SolutionTracer:
 
         while True:
             # if y out of bounds --> break
-            if (direction == self.Direction.Up and point[1] > self.ylim[1]) or (
-                direction == self.Direction.Down and point[1] < self.ylim[0]
+            if (direction == self.Direction.Up and py > self.ylim[1]) or (
+                direction == self.Direction.Down and py < self.ylim[0]
             ):
                 break
 
-            diff_to_next_point = np.array([0, get_y_step(point[1])])
+            step_x, step_y = 0, get_y_step(py)
 
             # if manual --> calculate diff to singularity
             if self.detection_strategy == TraceSettings.Strategy.Manual:
                 assert self.singularity_eq is not None
                 try:
-                    singularity = find_first_intersection(
-                        self.singularity_eq,
-                        self.slope_func(point[0], point[1]),
-                        point[0],
-                        point[1],
-                    )
-                except:
+                    singularity = find_first_intersection(self.singularity_eq, der, px, py)
+                except evaluation_errors:
                     break
 
-                diff = np.array([singularity[0] - point[0], singularity[1] - point[1]])
+                diff_x, diff_y = singularity[0] - px, singularity[1] - py
 
                 # if on screen
-                if self.ylim[0] <= point[1] <= self.ylim[1]:
+                if self.ylim[0] <= py <= self.ylim[1]:
                     # if the point is getting far from the singularity --> STOP
-                    if vector_length(diff) > self.diagonal_len / 100:
+                    if vector_length(diff_x, diff_y) > self.diagonal_len / 100:
                         break
                 # if out of bounds
                 else:
-                    if vector_length(diff) > 10 * original_dist:
+                    if vector_length(diff_x, diff_y) > 10 * original_dist:
                         break
 
                 # correct the x-position
-                diff_to_next_point += diff / 2
+                step_x += diff_x / 2
+                step_y += diff_y / 2
 
-            # calculate slope here and at the next point
+            # calculate slope at the next point
             try:  # slope_func is unsafe
-                der = self.slope_func(point[0], point[1])
-                n_der = self.slope_func(
-                    point[0] + diff_to_next_point[0], point[1] + diff_to_next_point[1]
-                )
-            except:
+                n_der = self.slope_func(px + step_x, py + step_y)
+            except evaluation_errors:
                 break
 
             # if the slope changes sign --> STOP
             if sign(der) != sign(n_der):
                 break
 
-            point += diff_to_next_point
+            px += step_x
+            py += step_y
+            der = n_der
 
             # if by correcting position for MANUAL detection, the point got moved far from x0
             # something is wrong --> STOP
-            if fabs(point[0] - x0) > (self.xlim[1] - self.xlim[0]) / 50:
+            if fabs(px - x0) > (self.xlim[1] - self.xlim[0]) / 50:
                 break
 
-            current_line_segment_length += vector_length(diff_to_next_point)
-            if self.should_yield_point(point, current_line_segment_length, line_segment_start):
-                yield (x0, point[1])
-                line_segment_start = point.copy()
+            current_line_segment_length += vector_length(step_x, step_y)
+            if self.should_yield_point(py, current_line_segment_length, line_segment_start_y):
+                yield (x0, py)
+                line_segment_start_y = py
                 current_line_segment_length = 0
 
-        yield (x0, point[1])
+        yield (x0, py)
 
     def trace(self, x0, y0, direction) -> Iterator[Tuple[float, float]]:
         """
@@ -397,64 +430,53 @@ class SolutionTracer:
         yield (x0, y0)
         self.direction = direction
 
-        point = np.array([x0, y0])  # current point
-        last_point = point.copy()  # last point
-
-        # manual detection
-        self.min_step = (
-            self.diagonal_len / 10 ** self.settings.get_trace_min_step_granularity()
-        )
-        self.max_step = (
-            self.diagonal_len / 10 ** self.settings.get_trace_max_step_granularity()
-        )
-        self.singularity_alert_distance = (
-            self.diagonal_len / 10 ** self.settings.get_singularity_alert_dist_granularity()
-        )
-
-        # max_dx is the maximum step size in x direction
-        x_diff = self.xlim[1] - self.xlim[0]
-        self.max_dx = (x_diff) / 10 ** self.settings.get_trace_dx_granularity()
-        # sing_dx is the step size used when a singularity is detected in auto-detection mode
-        self.sing_dx = min(1e-6, self.max_dx / 1000)
+        px, py = x0, y0  # current point
+        last_px, last_py = px, py  # last point
 
         # gives the number of times in a row the tracing continued after a singularity was detected
         # is used in auto-detection mode
         continue_count = 0
         current_line_segment_length = 0  # for adding new points
-        line_segment_start = point.copy()
+        line_segment_start_y = py
+
+        # local names for what every step reads, a local lookup is cheaper than an attribute lookup
+        slope_func = self.slope_func
+        x_min, x_max = self.xlim
+        y_min, y_max = self.ylim
+        max_dx, max_step = self.max_dx, self.max_step
+        manual_detection = self.detection_strategy == TraceSettings.Strategy.Manual
 
         while True:
-            try:  # slope_func is unsafe
-                self.slope = self.slope_func(point[0], point[1])
-                self.vector = np.array([1, self.slope]) * direction
-            except:
+            try:  # slope_func is unsafe, float() also rejects complex results
+                self.slope = float(slope_func(px, py))
+            except evaluation_errors:
                 break
+            # the x part of the tangent vector is +-1 --> resizing it by x is just a multiplication
+            self.vector = (direction, self.slope * direction)
 
             # if the slope is too big --> end
-            if vector_length(self.vector) == np.inf:
+            if vector_length(*self.vector) == np.inf:
                 return
 
             # no singularity detected
-            if not self.possible_singularity_at(point[0], point[1]):
+            if not self.possible_singularity_at(px, py):
                 continue_count = 0  # reset continue count
-                self.vector = resize_vector_by_x(self.vector, self.max_dx)
+                self.vector = (direction * max_dx, self.slope * direction * max_dx)
 
                 # if not out of bounds and the step is too big, resize it
                 # allow big steps out of bounds to save time
-                if (
-                    self.ylim[0] <= point[1] <= self.ylim[1]
-                    and vector_length(self.vector) > self.max_step
-                ):
-                    self.vector = resize_vector(self.vector, self.max_step)
+                if y_min <= py <= y_max and vector_length(*self.vector) > max_step:
+                    self.vector = resize_vector(*self.vector, max_step)
 
-                if self.detection_strategy == TraceSettings.Strategy.Manual:
+                if manual_detection:
                     # if the step would overshoot a possible singularity, resize it
-                    if vector_length(self.vector) >= (l := vector_length(self.sing_diff) / 3):
-                        self.vector = resize_vector(self.vector, l)
+                    if vector_length(*self.vector) >= (l := vector_length(*self.sing_diff) / 3):
+                        self.vector = resize_vector(*self.vector, l)
+
             # singularity detected
             else:
                 # get strategy on how to proceed
-                strategy = self.handle_singularity(point[0], point[1])
+                strategy = self.handle_singularity(px, py)
 
                 # if tracing should stop
                 if strategy == self.Strategy.Stop:
@@ -463,71 +485,72 @@ class SolutionTracer:
                 # if the function goes off to infinity
                 if strategy == self.Strategy.Infinite:
                     # calculate last line segment
-                    last_x, last_y = last_point[0], last_point[1]
-                    last_slope = self.slope_func(last_x, last_y)
+                    last_slope = slope_func(last_px, last_py)
                     if sign(last_slope) != sign(self.slope):
                         self.slope = last_slope
-                        point = last_point
+                        px, py = last_px, last_py
 
                     if sign(self.slope) == 0:
-                        yield (point[0], point[1])
+                        yield (px, py)
                         return
 
                     line_direction = sign(self.slope) * direction
 
-                    yield from self.create_infinite_line(point[0], point[1], line_direction)
+                    yield from self.create_infinite_line(px, py, line_direction)
                     return
 
                 # if the tracing should continue
                 if strategy == self.Strategy.Continue:
                     # manual detection
-                    if self.detection_strategy == TraceSettings.Strategy.Manual:
-                        step_size = np.clip(
-                            vector_length(self.sing_diff) / 3, 0, self.max_step
-                        )
-                        self.vector = resize_vector(self.vector, step_size)
+                    if manual_detection:
+                        step_size = min(vector_length(*self.sing_diff) / 3, max_step)
+                        self.vector = resize_vector(*self.vector, step_size)
                         # if the step is too big, resize it
-                        if fabs(self.vector[0]) > self.max_dx:
-                            self.vector = resize_vector_by_x(self.vector, self.max_dx)
+                        if fabs(self.vector[0]) > max_dx:
+                            self.vector = resize_vector_by_x(*self.vector, max_dx)
 
                     # automatic detection
                     else:
                         continue_count += 1
                         # resize vector to have normal dx
-                        self.vector = resize_vector_by_x(self.vector, self.max_dx)
+                        self.vector = (direction * max_dx, self.slope * direction * max_dx)
 
                         # if we continued a couple times in a row and the function seems to be monotonic ahead
                         # --> probably safe
                         if continue_count % 10 == 0 and self.is_monotonous_on(
-                            point, 2 * self.vector, 20
+                            px, py, 2 * self.vector[0], 2 * self.vector[1], 20
                         ):
                             pass  # keep normal dx
 
                         else:
                             # resize vector to have the same dx as is used in singularity detection
                             # step of this size should be safe
-                            self.vector = resize_vector_by_x(self.vector, self.sing_dx)
+                            self.vector = (
+                                direction * self.sing_dx,
+                                self.slope * direction * self.sing_dx,
+                            )
 
             # move to the next point
-            last_point = point.copy()
-            point += self.vector
+            step_x, step_y = self.vector
+            last_px, last_py = px, py
+            px += step_x
+            py += step_y
 
-            # if x is out of bounds --> break
-            if point[0] < self.xlim[0] or point[0] > self.xlim[1]:
+            # if x is out of bounds (or not a number anymore) --> break
+            if not x_min <= px <= x_max:
                 break
 
             # if y is out of bounds --> maybe break
-            if point[1] < self.ylim[0] or point[1] > self.ylim[1]:
-                if self.should_stop_if_y_out_of_bounds(point[1]):
-                    break
+            if not y_min <= py <= y_max and self.should_stop_if_y_out_of_bounds(py):
+                break
 
             # yield a new point if the segment has reached the desired length
-            current_line_segment_length += vector_length(self.vector)
+            current_line_segment_length += hypot(step_x, step_y)
 
-            if self.should_yield_point(point, current_line_segment_length, line_segment_start):
-                yield (point[0], point[1])
-                line_segment_start = point.copy()
+            if self.should_yield_point(py, current_line_segment_length, line_segment_start_y):
+                yield (px, py)
+                line_segment_start_y = py
                 current_line_segment_length = 0
 
         # yield the last point
-        yield (point[0], point[1])
+        yield (px, py)
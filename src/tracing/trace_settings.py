@@ -30,6 +30,18 @@ class TraceSettings:
         Manual = 1
         None_ = 2
 
+    # fixed set of attributes --> no per-instance __dict__, the tracer reads these on every step
+    __slots__ = (
+        "line_color",
+        "line_width",
+        "y_margin",
+        "trace_precision",
+        "singularity_min_slope",
+        "show_advanced_settings",
+        "singularity_equations",
+        "preferred_detection",
+    )
+
     def __init__(self):
         self.line_color = DEFAULT_TRACE_COLOR
         self.line_width = DEFAULT_TRACE_LINES_WIDTH
@@ -42,7 +54,7 @@ class TraceSettings:
         self.preferred_detection = dict()  # slope function string -> detection strategy
 
     def copy(self):
-        """Returns a copy if itself"""
+        """Returns a copy if itself, a new attribute has to be added here and to __slots__"""
         new = TraceSettings()
         new.line_color = self.line_color
         new.line_width = self.line_width
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from src.math_functions import create_function_from_string
+from src.direction_field.direction_field_settings import DirectionFieldSettings
+from src.direction_field.direction_field_builder import DirectionFieldBuilder
+
+
+def create_builder(function_string):
+    settings = DirectionFieldSettings()
+    settings.function_string = function_string
+    settings.function = create_function_from_string(function_string)
+    # the plot is only needed for drawing, not for evaluating directions
+    return DirectionFieldBuilder(None, settings)
+
+
+@pytest.mark.parametrize("function_string", ["log(x)", "ln(x)", "1/x", "sqrt(x)", "x/y", "log(x*x)"])
+def test_vectorized_directions_match_point_by_point(function_string):
+    # both grids contain 0 --> points where the function is undefined or the slope is infinite
+    grid_x, grid_y = np.meshgrid(np.linspace(-2, 2, 9), np.linspace(-2, 2, 9), indexing="ij")
+    xs, ys = grid_x.ravel(), grid_y.ravel()
+
+    # same error state as the app
+    with np.errstate(divide="raise", invalid="ignore"):
+        centers, directions = create_builder(function_string).get_directions_on_grid(xs, ys)
+        expected_centers, expected_directions = create_builder(
+            function_string
+        ).get_directions_point_by_point(xs, ys)
+
+    np.testing.assert_array_equal(centers, expected_centers)
+    np.testing.assert_allclose(directions, expected_directions, rtol=1e-12)